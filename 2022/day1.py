@@ -6,40 +6,106 @@ Advent of Code 2022, Day 1, Part 1 and Part 2.
 
 Simple text file parsing.
 
+Two methods, chosen by "method":
+    'stream': read the file a block at a time, parse each block in bulk,
+        keep a running total for the elf in progress, and keep only the
+        top k totals in a heap. Constant memory for any input size.
+    'sort': the original approach. Read every elf into a list, total them
+        all and sort the totals. Memory grows with the input.
+Compare them with "python -m aoc scale 2022/day1 --set method=sort".
+
 Created on Sat Dec  3 10:28:06 2022
 
 @author: randyppa
 """
 
-import time
+infile = 'input/input.2022day1.txt'
+
+import heapq
+import numpy as np
+from aoc.reader import Source
+from aoc.parsing import line_ints
+
+method = 'stream'
+top = 3             # Number of elves in Part 2
+BLOCK = 1 << 18     # Bytes of input parsed at a time
 
 # INPUT PROCESSING
-tic = time.perf_counter()
-with open('input/input.2022day1.txt', 'r') as f:
+# Nothing is read here. Each part streams the file, so the input can be
+# any size.
+def parse(infile):
+    return Source(infile)
+
+# Totals of the elves, as an array for each block of the file. An elf is a
+# group of lines between blank lines, and can go on into the next block.
+def elf_totals(source):
+    in_progress = None      # Total so far of an elf not yet ended
+    for block in source.blocks(BLOCK):
+        lines = line_ints(block)
+        blank = lines.counts == 0
+        values = lines.values
+        if values.size == 0:
+            if blank.any() and in_progress is not None:
+                yield np.array([in_progress])
+                in_progress = None
+            continue
+        # Elf of each value, counting from the first one in this block
+        elf = np.cumsum(blank)[~blank]
+        firsts = np.flatnonzero(np.diff(elf)) + 1
+        totals = np.add.reduceat(values, np.concatenate(([0], firsts)))
+        if in_progress is not None:
+            if elf[0] == 0:     # No blank line before it: the same elf
+                totals[0] += in_progress
+            else:
+                totals = np.concatenate(([in_progress], totals))
+        # The last elf goes on if there's no blank line after it
+        if elf[-1] == blank.sum():
+            in_progress = int(totals[-1])
+            totals = totals[:-1]
+        else:
+            in_progress = None
+        yield totals
+    if in_progress is not None:
+        yield np.array([in_progress])
+
+# The original approach: every elf as a list of food values
+def elf_lists(source):
     elf = []        # One elf is a list of food values
     elves = []      # List of elves.
-    for line in f:
+    for line in source.lines():
         valstr = line.strip()
         if len(valstr) == 0:    # Blank line. End of this elf's data
             elves.append(elf)
             elf = []
         else:
             elf.append(int(valstr))
-    
     if len(elf) > 0:    # If file didn't end with a blank, add the last elf
         elves.append(elf)
-        elf = []
-
-elf_totals = [sum(elf) for elf in elves]
+    return elves
 
+# The k highest totals, highest first
+def top_totals(source, k):
+    if method == 'sort':
+        totals = [sum(elf) for elf in elf_lists(source)]
+        totals.sort(reverse=True)
+        return totals[:k]
+    # A heap of at most k totals, smallest on top. From each block only its
+    # own top k can get in.
+    heap = []
+    for totals in elf_totals(source):
+        if len(totals) > k:
+            totals = np.partition(totals, -k)[-k:]
+        for total in totals.tolist():
+            if len(heap) < k:
+                heapq.heappush(heap, total)
+            elif total > heap[0]:
+                heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
 
 # PART 1: Find highest total.
-# Part 2: Find total of top 3 totals
+def part_a(source):
+    return top_totals(source, 1)[0]
 
-elf_totals.sort(reverse=True)
-toc = time.perf_counter()
-print(f'{len(elves)} elves found')
-print(f'Top three totals = {elf_totals[0]}, {elf_totals[1]}, {elf_totals[2]}')
-print(f'Highest total is {elf_totals[0]}')
-print(f'Sum of top three is {sum(elf_totals[0:3])}')
-print(f'Total execution time = {(toc - tic) * 1000} ms')
+# Part 2: Find total of top 3 totals
+def part_b(source):
+    return sum(top_totals(source, top))
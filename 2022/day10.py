@@ -8,88 +8,181 @@ and values in a register.
 
 Part 2. Add drawing to the program
 
+Rework: the program is compiled once, in parse, into arrays of opcodes and
+operands (see aoc/vm.py), with the instructions and their cycle counts
+registered in "device". Two methods, chosen by "method":
+    'trace': the value of the x register during every cycle, as arrays.
+        Each instruction holds x for as many cycles as it takes (np.repeat
+        over the costs), and x during an instruction is 1 plus the sum of
+        all the addx before it (np.cumsum). The signal strengths are a
+        lookup at the magic cycles, and the pixels are lit where the
+        sprite covers the beam.
+    'vm': run the program on the VM, with hooks at the magic cycles for
+        Part 1 and at every cycle for Part 2.
+
+The trace is made a block of instructions at a time, and Part 2 draws each
+block on a CRT of WIDTH x HEIGHT pixels, which keeps only one frame. Rows
+are written out as they are finished: set "stream" to a file name, or '-'
+for stdout, to watch them go by. When the beam reaches the bottom it starts
+again at the top, drawing over the last frame, so a program of any length
+draws in constant memory. The answer is the screen at the end.
+
 Created on Sat Dec 10 07:58:02 2022
 
 @author: randyppa
 """
 
-import time
+import sys
+import numpy as np
+from aoc.parsing import read
+from aoc.vm import InstructionSet, Machine
+
+infile = 'input/input.2022day10.txt'
+#infile = 'input/test.2022day10.txt'
+
+method = 'trace'
+stream = None       # File to write the screen's rows to, '-' for stdout
+CHUNK = 1 << 16     # Instructions traced at a time
 
-def render(ram, row_len):
-    ram_size = len(ram)
-    for pix in range(0, ram_size, row_len):
-        print(''.join(ram[pix:pix + row_len]))
 
+# The device's instructions, with their duration in cycles. There are only
+# two: noop (do nothing) and addx (add the argument to the x register).
+device = InstructionSet()
+device.register('noop', 1)
 
-tic = time.perf_counter()
+@device.opcode('addx', 2)
+def addx(machine, arg):
+    machine.reg['x'] += arg
+
+ADDX = device.numbers['addx']
 
 # Some useful numbers
-timing = {'noop':1, 'addx':2}  # Command duration in cycles
 magic = [20, 60, 100, 140, 180, 220]   # When to check register value
-
-program = []
-# Read the command lines.
-# There are only two commands: noop (do nothing) and addx (add the argument
-# to the x register)
-#with open('input/test.2022day10.txt', 'r') as f:
-with open('input/input.2022day10.txt', 'r') as f:
-    for line in f:
-        # "compile" into command, effect on x register, and instruction time
-        cmd = line.strip().split(' ')
-        tokens = [cmd[0], 0, 0]
-        if tokens[0] == 'addx':
-            tokens[1] = int(cmd[1])
-        tokens[2] = timing[cmd[0]]
-        
-        program.append(tokens)
-
-toc = time.perf_counter()
-
-# Part 1: Execute the program
-x_reg = 1 # WARNING! BOTH OF THESE START AT 1, NOT 0!
-cycle = 1
-check = 0
-next_check = magic[check]
-total_value = 0
-for cmd in program:
-    cycle_end = cycle + cmd[2]
-    if next_check >= cycle and next_check < cycle_end:
-        total_value += x_reg * next_check
-        check += 1
-        if check < len(magic):
-            next_check = magic[check]
-    x_reg += cmd[1]
-    cycle = cycle_end
-
-toc2 = time.perf_counter()
-
-# Part 2: Execute and draw
-x_reg = 1
-cycle = 1
-pixel = 0 # This cycles 0-39
-rows = 10
-ram_size = rows * 40
-screen_ram = ['.' for _ in range(ram_size)]
-row = 0  # Increments by 1 every 40
-for cmd in program:
-    cycle_end = cycle + cmd[2]
-    while cycle < cycle_end:
-        if pixel >= x_reg - 1 and pixel <= x_reg + 1:
-            screen_ram[cycle - 1] = '#'
-        cycle += 1
-        pixel += 1
-        if pixel >= 40:
-            pixel = 0
-    x_reg += cmd[1]
-
-toc3 = time.perf_counter()
-
-print(f'Time for input processing = {(toc - tic) * 1000} ms')
-print(f'Time to execute Elf program = {(toc2 - toc) * 1000} ms')
-print(f'Part 1: Total of signal values = {total_value}')
-        
-# Display the contents of screen RAM, 40 pixels per row
-print('Part 2:')
-render(screen_ram, 40)
-
-print(f'Time for Part 2 = {(toc3 - toc2) * 1000} ms')
+WIDTH = 40      # Pixels per row of the screen
+HEIGHT = 10     # Rows of the screen
+LIT = ord('#')
+DARK = ord('.')
+
+
+# A screen drawn a pixel at a time, left to right and top to bottom, over
+# and over. It holds one frame; each row finished is also written to out
+# (a text file), if given, with a blank line between frames.
+class CRT:
+    def __init__(self, width=WIDTH, height=HEIGHT, out=None):
+        self.width = width
+        self.height = height
+        self.out = out
+        self.frame = np.full((height, width), DARK, dtype=np.uint8)
+        self.drawn = 0          # Pixels drawn so far, over all frames
+
+    # Write the rows of the frame from row on (a count over all frames)
+    def _write(self, rows, row):
+        if self.out is None:
+            return
+        if row % self.height == 0 and row > 0:
+            self.out.write('\n')
+        text = np.empty((len(rows), self.width + 1), dtype=np.uint8)
+        text[:, :-1] = rows
+        text[:, -1] = ord('\n')
+        self.out.write(text.tobytes().decode())
+
+    # Draw the next pixel: lit or not
+    def put(self, lit):
+        row, col = divmod(self.drawn, self.width)
+        self.frame[row % self.height, col] = LIT if lit else DARK
+        self.drawn += 1
+        if col == self.width - 1:
+            here = row % self.height
+            self._write(self.frame[here:here + 1], row)
+
+    # Draw the next pixels, given as a bool array of which are lit
+    def draw(self, lit):
+        pixels = np.where(lit, LIT, DARK).astype(np.uint8)
+        while pixels.size > 0:
+            row, col = divmod(self.drawn, self.width)
+            here = row % self.height
+            if col > 0 or pixels.size < self.width:
+                # Part of a row
+                take = min(self.width - col, pixels.size)
+                self.frame[here, col:col + take] = pixels[:take]
+                if col + take == self.width:
+                    self._write(self.frame[here:here + 1], row)
+            else:
+                # Whole rows, up to the bottom of the frame
+                nrows = min(pixels.size // self.width, self.height - here)
+                take = nrows * self.width
+                rows = pixels[:take].reshape(nrows, self.width)
+                self.frame[here:here + nrows] = rows
+                self._write(rows, row)
+            self.drawn += take
+            pixels = pixels[take:]
+
+    def render(self):
+        return '\n'.join(row.tobytes().decode() for row in self.frame)
+
+
+def parse(infile):
+    return device.compile(read(infile))
+
+# The x register during each cycle, a block of instructions at a time: the
+# first block starts with cycle 1
+def x_blocks(program):
+    x_reg = 1
+    costs = program.costs
+    args = np.where(program.ops == ADDX, program.operands, 0)
+    for first in range(0, len(args), CHUNK):
+        block = args[first:first + CHUNK]
+        # x during each instruction is x after all the ones before it
+        x_during = np.empty(len(block), dtype=np.int64)
+        x_during[0] = x_reg
+        x_during[1:] = x_reg + np.cumsum(block[:-1])
+        x_reg += int(block.sum())
+        yield np.repeat(x_during, costs[first:first + CHUNK])
+
+# Part 1: Sum of cycle times x register, at the magic cycles the program
+# reaches
+def part_a(program):
+    if method == 'vm':
+        machine = Machine(program, x=1) # WARNING! BOTH OF THESE START AT 1!
+        total_value = 0
+        def check(machine, cycle):
+            nonlocal total_value
+            total_value += machine.reg['x'] * cycle
+        machine.at(magic, check)
+        machine.run()
+        return total_value
+    total_value = 0
+    cycles = np.array(magic)
+    done = 0    # Cycles before this block
+    for x_reg in x_blocks(program):
+        here = cycles[(cycles > done) & (cycles <= done + len(x_reg))]
+        total_value += int(np.dot(here, x_reg[here - done - 1]))
+        done += len(x_reg)
+        if done >= cycles.max():
+            break
+    return total_value
+
+# Part 2: Execute and draw. Returns the screen at the end, WIDTH pixels per
+# row
+def part_b(program):
+    if stream is None:
+        return draw(program, None)
+    if stream == '-':
+        return draw(program, sys.stdout)
+    with open(stream, 'w') as out:
+        return draw(program, out)
+
+def draw(program, out):
+    crt = CRT(WIDTH, HEIGHT, out)
+    if method == 'vm':
+        machine = Machine(program, x=1)
+        def beam(machine, cycle):
+            pixel = (cycle - 1) % WIDTH     # This cycles 0-39
+            crt.put(abs(pixel - machine.reg['x']) <= 1)
+        machine.every(beam)
+        machine.run()
+        return crt.render()
+    for x_reg in x_blocks(program):
+        pixel = np.arange(crt.drawn, crt.drawn + len(x_reg)) % WIDTH
+        crt.draw(np.abs(pixel - x_reg) <= 1)
+    return crt.render()
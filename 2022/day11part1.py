@@ -11,7 +11,12 @@ Created on Sun Dec 11 07:46:47 2022
 
 @author: randyppa
 """
-import time
+import copy
+
+from aoc import counters
+
+infile = 'input/input.2022day11.txt'
+#infile = 'input/test.2022day11.txt'
 
 class Monkey:
     def __init__(self):
@@ -61,56 +66,50 @@ class Monkey:
         output += f' else throw to {self.iffalse}\n'
         return output
 
-tic = time.perf_counter()
 # Input parsing
-all_monkeys = []
-monkey = None
-#with open('input/test.2022day11.txt', 'r') as f:
-with open('input/input.2022day11.txt', 'r') as f:
-    for line in f:
-        tokens = line.strip().split()
-        if len(tokens) == 0:
-            continue
-        
-        if tokens[0] == 'Monkey':
-            monkey = Monkey()
-            monkey.index = len(all_monkeys)
-            all_monkeys.append(monkey)
-        elif tokens[0] == 'Starting':
-            monkey.items = [int(item.replace(',', ' ')) for item in tokens[2:]]
-        elif tokens[0] == 'Operation:':
-            arg = int(tokens[-1]) if tokens[-1].isnumeric() else None
-            monkey.op = (tokens[-2], arg)
-        elif tokens[0] == 'Test:':
-            monkey.testval = int(tokens[-1])
-        elif tokens[0] == 'If':
-            if tokens[1] == 'true:':
-                monkey.iftrue = int(tokens[-1])
-            else:
-                monkey.iffalse = int(tokens[-1])
-
-#for monkey in all_monkeys:
-#    print(monkey)
-toc1 = time.perf_counter()
+def parse(infile):
+    all_monkeys = []
+    monkey = None
+    with open(infile, 'r') as f:
+        for line in f:
+            tokens = line.strip().split()
+            if len(tokens) == 0:
+                continue
+            
+            if tokens[0] == 'Monkey':
+                monkey = Monkey()
+                monkey.index = len(all_monkeys)
+                all_monkeys.append(monkey)
+            elif tokens[0] == 'Starting':
+                monkey.items = [int(item.replace(',', ' ')) for item in tokens[2:]]
+            elif tokens[0] == 'Operation:':
+                arg = int(tokens[-1]) if tokens[-1].isnumeric() else None
+                monkey.op = (tokens[-2], arg)
+            elif tokens[0] == 'Test:':
+                monkey.testval = int(tokens[-1])
+            elif tokens[0] == 'If':
+                if tokens[1] == 'true:':
+                    monkey.iftrue = int(tokens[-1])
+                else:
+                    monkey.iffalse = int(tokens[-1])
+    return all_monkeys
 
 # Part 1. Loop through the monkeys 20 times
-for rounds in range(20):
+def part_a(all_monkeys):
+    # The monkeys are modified as the items move. Work on a copy so the
+    # parsed input can be reused.
+    all_monkeys = copy.deepcopy(all_monkeys)
+    for rounds in range(20):
+        for monkey in all_monkeys:
+            while len(monkey.items) > 0:
+                item = monkey.inspect(monkey.items.pop(0))
+                all_monkeys[monkey.throwto(item)].additem(item)
+    
+    counts = []
     for monkey in all_monkeys:
-        while len(monkey.items) > 0:
-            item = monkey.inspect(monkey.items.pop(0))
-            all_monkeys[monkey.throwto(item)].additem(item)
-
-counts = []
-for monkey in all_monkeys:
-    counts.append(monkey.inspect_count)
-
-counts.sort(reverse=True)
-toc2 = time.perf_counter()
-print(f'Time to parse input = {(toc1 - tic) * 1000} ms')
-print('Final inspection counts')
-for monkey in all_monkeys:
-    print(f'Monkey {monkey.index} inspected {monkey.inspect_count} items')
-
-print(f'Top two counts = {counts[0:2]}')
-print(f'Product = {counts[0] * counts[1]}')
-print(f'Time for Part 1 = {(toc2 - toc1) * 1000} ms')
\ No newline at end of file
+        counts.append(monkey.inspect_count)
+    counters.count('inspections', sum(counts))
+    
+    counts.sort(reverse=True)
+    # Product of the top two counts
+    return counts[0] * counts[1]
@@ -15,11 +15,36 @@ As a result, the numbers quickly become huge and arithmetic becomes unwieldy
 to the point that 10000 iterations may take hours or days. Instead of direct
 arithmetic, a modulo approach is used.
 
+The engine is chosen by "method":
+    'arrays': for each monkey, a NumPy array of the worry levels of the
+        items it holds, kept modulo the LCM of the test values (which keeps
+        every test's answer). A monkey's turn is a few array operations on
+        the items it holds. The items are independent, so the order within
+        a monkey's turn doesn't matter. The cost is mostly a fixed amount
+        per turn: about 0.2 s for 10000 rounds of 8 monkeys with a few
+        dozen items, 0.7 s with 360 items and 1.4 s with 3600.
+    'items': the original. Each item keeps its value modulo every test
+        value in a dict, and each monkey works through its list of items.
+        The cost grows with the number of items: 0.2 s for the 10-item
+        sample, 1.5 s for 36 items.
+    'auto' (the default): 'items' below ARRAYS_FROM items, else 'arrays'.
+
 Created on Sun Dec 11 07:46:47 2022
 
 @author: randyppa
 """
-import time
+import copy
+import math
+import collections
+import numpy as np
+from aoc import progress, counters
+
+verbose = 0
+method = 'auto'
+ARRAYS_FROM = 16     # Fewest items for which 'arrays' is faster
+ROUNDS = 10000
+infile = 'input/input.2022day11.txt'
+#infile = 'input/test.2022day11.txt'
 
 # This is the guts of the Part 2 solution. Monkeys decide where to throw an
 # item based on their value modulo some key. Rather than a numerical value,
@@ -101,61 +126,142 @@ class Monkey:
         output += f' else throw to {self.iffalse}\n'
         return output
 
-tic = time.perf_counter()
 # Input parsing
-all_monkeys = []
-monkey = None
-#with open('input/test.2022day11.txt', 'r') as f:
-with open('input/input.2022day11.txt', 'r') as f:
-    for line in f:
-        tokens = line.strip().split()
-        if len(tokens) == 0:
-            continue
-        
-        if tokens[0] == 'Monkey':
-            monkey = Monkey()
-            monkey.index = len(all_monkeys)
-            all_monkeys.append(monkey)
-        elif tokens[0] == 'Starting':
-            for item in tokens[2:]:
-                monkey.addvalue(int(item.replace(',', ' ')))
-        elif tokens[0] == 'Operation:':
-            arg = int(tokens[-1]) if tokens[-1].isnumeric() else None
-            monkey.op = (tokens[-2], arg)
-        elif tokens[0] == 'Test:':
-            monkey.testval = int(tokens[-1])
-        elif tokens[0] == 'If':
-            if tokens[1] == 'true:':
-                monkey.iftrue = int(tokens[-1])
+def parse(infile):
+    all_monkeys = []
+    monkey = None
+    with open(infile, 'r') as f:
+        for line in f:
+            tokens = line.strip().split()
+            if len(tokens) == 0:
+                continue
+            
+            if tokens[0] == 'Monkey':
+                monkey = Monkey()
+                monkey.index = len(all_monkeys)
+                all_monkeys.append(monkey)
+            elif tokens[0] == 'Starting':
+                for item in tokens[2:]:
+                    monkey.addvalue(int(item.replace(',', ' ')))
+            elif tokens[0] == 'Operation:':
+                arg = int(tokens[-1]) if tokens[-1].isnumeric() else None
+                monkey.op = (tokens[-2], arg)
+            elif tokens[0] == 'Test:':
+                monkey.testval = int(tokens[-1])
+            elif tokens[0] == 'If':
+                if tokens[1] == 'true:':
+                    monkey.iftrue = int(tokens[-1])
+                else:
+                    monkey.iffalse = int(tokens[-1])
+    return all_monkeys
+
+# All the items as arrays: for each monkey, the worry levels of the items
+# it holds, modulo the LCM of the test values (in pieces, as they were
+# thrown to it). Only the counts of inspections are wanted, so the items
+# need no identity. Items with the same worry level held by the same monkey
+# will always go the same way, so they are kept once, with a weight.
+class Troop:
+    def __init__(self, all_monkeys):
+        self.monkeys = all_monkeys
+        self.modulus = math.lcm(*(monkey.testval for monkey in all_monkeys))
+        # Operands are reduced too, so products are at most (modulus - 1)**2
+        self.ops = [(op, None if arg is None else arg % self.modulus)
+                    for op, arg in (monkey.op for monkey in all_monkeys)]
+        # Products have to fit in an int64; if not, use Python ints
+        dtype = np.int64 if (self.modulus - 1) ** 2 < 2 ** 63 else object
+        # Count the items of each (monkey, worry level) in Python ints, so
+        # nothing can overflow whatever the modulus
+        items = collections.Counter((index, value % self.modulus)
+                                    for index, monkey in enumerate(all_monkeys)
+                                    for value in monkey.start_vals)
+        self.single = all(count == 1 for count in items.values())
+        self.held = [[] for _ in all_monkeys]
+        self.weights = [[] for _ in all_monkeys]
+        for index in range(len(all_monkeys)):
+            mine = [(value, count) for (owner, value), count in items.items()
+                    if owner == index]
+            if mine:
+                self.held[index].append(
+                    np.array([value for value, _ in mine], dtype=dtype))
+                self.weights[index].append(
+                    np.array([count for _, count in mine], dtype=np.int64))
+        self.inspect_counts = [0] * len(all_monkeys)
+
+    # One round: every monkey in turn inspects and throws all it holds
+    def round(self):
+        held = self.held
+        weights = self.weights
+        modulus = self.modulus
+        single = self.single
+        for index, monkey in enumerate(self.monkeys):
+            pieces = held[index]
+            if not pieces:
+                continue
+            held[index] = []
+            values = pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+            if single:
+                self.inspect_counts[index] += values.size
+            else:
+                pieces = weights[index]
+                weights[index] = []
+                weight = pieces[0] if len(pieces) == 1 \
+                    else np.concatenate(pieces)
+                self.inspect_counts[index] += int(weight.sum())
+            op, arg = self.ops[index]
+            if op == '*':
+                values *= values if arg is None else arg
             else:
-                monkey.iffalse = int(tokens[-1])
+                values += arg
+            values %= modulus
+            divisible = values % monkey.testval == 0
+            # Skip empty pieces, so that idle monkeys cost nothing
+            for target, which in ((monkey.iftrue, divisible),
+                                  (monkey.iffalse, ~divisible)):
+                if which.any():
+                    held[target].append(values[which])
+                    if not single:
+                        weights[target].append(weight[which])
+
+def monkey_business(counts):
+    counters.count('inspections', sum(counts))
+    counts = sorted(counts, reverse=True)
+    # Product of the top two counts
+    return counts[0] * counts[1]
 
-toc1 = time.perf_counter()
+def part_b(all_monkeys):
+    engine = method
+    if engine == 'auto':
+        nitems = sum(len(monkey.start_vals) for monkey in all_monkeys)
+        engine = 'arrays' if nitems >= ARRAYS_FROM else 'items'
+    if engine == 'arrays':
+        troop = Troop(all_monkeys)
+        progress.total(ROUNDS)
+        for rounds in range(ROUNDS):
+            progress.step()
+            troop.round()
+        return monkey_business(troop.inspect_counts)
 
-# Build the modular representations
-keys = [monkey.testval for monkey in all_monkeys]
-for monkey in all_monkeys:
-    monkey.set_item_keys(keys)
-    print(monkey)
+    # The monkeys are modified as the items move. Work on a copy so the
+    # parsed input can be reused.
+    all_monkeys = copy.deepcopy(all_monkeys)
 
-# Part 2. Loop through the monkeys 10000 times
-for rounds in range(10000):
+    # Build the modular representations
+    keys = [monkey.testval for monkey in all_monkeys]
     for monkey in all_monkeys:
-        while len(monkey.items) > 0:
-            item = monkey.inspect(monkey.items.pop(0))
-            all_monkeys[monkey.throwto(item)].additem(item)
-
-counts = []
-for monkey in all_monkeys:
-    counts.append(monkey.inspect_count)
-
-counts.sort(reverse=True)
-toc2 = time.perf_counter()
-print(f'Time to parse input = {(toc1 - tic) * 1000} ms')
-print('Final inspection counts')
-for monkey in all_monkeys:
-    print(f'Monkey {monkey.index} inspected {monkey.inspect_count} items')
-
-print(f'Top two counts = {counts[0:2]}')
-print(f'Product = {counts[0] * counts[1]}')
-print(f'Time for Part 2 = {toc2 - toc1} s')
\ No newline at end of file
+        monkey.set_item_keys(keys)
+        if verbose > 0:
+            print(monkey)
+    
+    # Part 2. Loop through the monkeys 10000 times
+    progress.total(ROUNDS)
+    for rounds in range(ROUNDS):
+        progress.step()
+        for monkey in all_monkeys:
+            # Monkeys never throw to themselves, so take the whole list
+            # rather than pop(0) each item
+            items, monkey.items = monkey.items, []
+            for item in items:
+                item = monkey.inspect(item)
+                all_monkeys[monkey.throwto(item)].additem(item)
+    
+    return monkey_business([monkey.inspect_count for monkey in all_monkeys])
@@ -8,159 +8,84 @@ Find the shortest path from a given start to end point over an elevation
 grid. Elevations go from 'a' to 'z' (start is at 'a', end is at 'z') and
 allowed steps are L, R, U, D and must be a change of elevation of 0 or 1.
 
-Approach: Djikstra's algorithm'
+Approach: Breadth-first search, since every step costs 1.
 
 Part 2. Use every 'a' as a start point and find the shortest of the shortest
-paths.
+paths. This is one search backwards from the end point, stopping at the
+first 'a' it reaches.
 
 Created on Mon Dec 12 09:09:01 2022
 
 @author: randyppa
 """
-import time
-#import numpy as np
+from aoc.grid import Grid
+from aoc import search
+
+verbose = 0
+infile = 'input/input.2022day12.txt'
+#infile = 'input/test.2022day12.txt'
 
-TheGrid = {}
 Infinity = 1e9 # A suitably large value to use as "infinity"
-class Gridpoint:
-    def __init__(self, height):
-        self.neighbors = []
-        self.visited = False
-        self.distance = Infinity
-        self.height = height
-        self.prev = None  # predecessor and successor on shortest path
-        self.next = None
-        
-# Djikstra's algorithm
-def shortest_path(startloc, endloc):
-    # Note: "current" is a set of coordinates, like (3,4). "curpoint" is the object
-    # describing that location.
-    unvisited_set = set() # The "unvisited set" keeps track of those with FINITE
-                          # distance from start
-                          
-    current = startloc
-    TheGrid[current].distance = 0
-    abort = False
-    while not abort and current != endloc:
-        curpoint = TheGrid[current]
-        for nbr in curpoint.neighbors:
-            if not TheGrid[nbr].visited:
-                tentative_distance = curpoint.distance + 1
-                if tentative_distance < TheGrid[nbr].distance:
-                    TheGrid[nbr].distance = tentative_distance
-                    TheGrid[nbr].prev = current
-                    if not nbr in unvisited_set:
-                        unvisited_set.add(nbr)
-        curpoint.visited = True
-        if current in unvisited_set:
-            unvisited_set.remove(current)
-        
-        if len(unvisited_set) > 0:
-            # Next point to consider is the unvisited point with smallest distance
-            current = min(unvisited_set, key = lambda xy: TheGrid[xy].distance)
-        else:
-            #print('ERROR! No path')
-            abort = True
-            return Infinity
-    return TheGrid[endloc].distance
+Border = 255   # Height of the border around the grid
 
-def show_shortest_path(endloc):
-    # For output, trace the path back and connect it up in the forward direction
-    current = endloc
-    while current in TheGrid.keys() and not TheGrid[current].prev is None:
-        curpoint = TheGrid[current]
-        TheGrid[curpoint.prev].next = current
-        current = curpoint.prev
+# The parsed map: a Grid of heights, 0 for 'a' to 25 for 'z', and the flat
+# indices of the start and end points
+class HeightMap:
+    def __init__(self, grid, startloc, endloc):
+        self.grid = grid
+        self.startloc = startloc
+        self.endloc = endloc
     
-    current = startloc
-    path = ''
-    while not current is None:
-        path += ' ' + str(current)
-        current = TheGrid[current].next
+    @property
+    def size(self):
+        return self.grid.flatcells.size
     
-    return path
-
-def reset_grid():
-    for point in TheGrid.values():
-        point.prev = None
-        point.next = None
-        point.distance = Infinity
-        point.visited = False
-        
-#======================================
-#  Begin script
-#======================================
-tic = time.perf_counter()
-grid = []
-#with open('input/test.2022day12.txt', 'r') as f:
-with open('input/input.2022day12.txt') as f:
-    for line in f:
-        grid.append([ord(c) - ord('a') for c in line.strip()])
-
-# Find start and end points
-startval = ord('S') - ord('a')
-endval = ord('E') - ord('a')
-startloc = (0, 0)
-endloc = (0, 0)
-nrows = len(grid)
-ncols = len(grid[0])
-#unvisited_set = set()
-
-for i, row in enumerate(grid):
-    if startval in row:
-        j = row.index(startval)
-        startloc = (i, j)
-        row[j] = 0
-    if endval in row:
-        j = row.index(endval)
-        endloc = (i, j)
-        row[j] = 25
-    # Convert to a dictionary of Gridpoint objects
-    for j in range(ncols):
-        TheGrid[(i,j)] = Gridpoint(row[j])
-        #unvisited_set.add((i,j))
+    # Legal steps go at most 1 up. The border is never more than 1 up.
+    def steps_up(self):
+        return search.grid_steps(self.grid,
+                                 lambda here, there: there - here <= 1)
+    
+    # The same steps, taken backwards
+    def steps_down(self):
+        return search.grid_steps(self.grid, lambda here, there:
+                                 (here - there <= 1) & (there != Border))
 
-# Identify neighbors (can be reached by a legal step)
-for i in range(nrows):
-    for j in range(ncols):
-        point = TheGrid[(i,j)]
-        if i > 0 and TheGrid[(i-1,j)].height - point.height <= 1:
-            point.neighbors.append( (i-1, j) )
-        if i < nrows - 1 and TheGrid[(i+1,j)].height - point.height <= 1:
-            point.neighbors.append( (i+1, j) )
-        if j > 0 and TheGrid[(i, j-1)].height - point.height <= 1:
-            point.neighbors.append( (i, j-1) )
-        if j < ncols - 1 and TheGrid[(i, j+1)].height - point.height <= 1:
-            point.neighbors.append( (i, j+1) )
-            
-toc = time.perf_counter()
-print(f'Time to load and setup = {(toc - tic) * 1000} ms')
+# Length of the shortest path, or Infinity if there is none
+def path_length(result):
+    distance = result.distance
+    return Infinity if distance is None else distance
 
-dist = shortest_path(startloc, endloc)
-path = show_shortest_path(endloc)
+def show_shortest_path(hmap, result):
+    # For output, list the (row, col) of each point on the path
+    return ' '.join(str(hmap.grid.rowcol(index)) for index in result.path())
 
-toc2 = time.perf_counter()
+def parse(infile):
+    grid = Grid.from_file(infile, fill=Border)
+    
+    # Find start and end points, and give them their heights
+    startloc = int(grid.find_flat(ord('S'))[0])
+    endloc = int(grid.find_flat(ord('E'))[0])
+    grid.flatcells[startloc] = ord('a')
+    grid.flatcells[endloc] = ord('z')
+    grid.inner[:, :] -= ord('a')
+    return HeightMap(grid, startloc, endloc)
 
-print(f'Shortest path from {startloc} to {endloc} is {path}')
-print(f'Path length = {TheGrid[endloc].distance}')
-print(f'Time for Part 1 = {toc2 - toc} s')
+def part_a(hmap):
+    result = search.bfs(hmap.size, [hmap.startloc], hmap.steps_up(),
+                        [hmap.endloc])
+    if verbose > 0:
+        path = show_shortest_path(hmap, result)
+        print(f'Shortest path from {hmap.grid.rowcol(hmap.startloc)} to '
+              f'{hmap.grid.rowcol(hmap.endloc)} is {path}')
+    return path_length(result)
 
-toc2 = time.perf_counter()
 # Part 2: Use every cell with height 0 ('a' in the original input) as a
-# startpoint. See which one has the shortest path to endloc.
-count = 0
-shortest_dist = Infinity
-for ij in TheGrid.keys():
-    if TheGrid[ij].height == 0:
-        reset_grid()
-        count += 1
-        dist = shortest_path(ij, endloc)
-        #print(f'Distance from {ij} = ' + 
-        #      'NO PATH' if dist == Infinity else f'{dist}')
-        if dist < shortest_dist:
-            shortest_dist = dist
-toc3 = time.perf_counter()
-print(f'{count} start points tested')
-print(f'Shortest of shortest paths = {shortest_dist}')
-print(f'Time for Part 2 = {toc3 - toc2}')
-         
\ No newline at end of file
+# startpoint. Searching back from endloc, the first one reached has the
+# shortest path.
+def part_b(hmap):
+    starts = hmap.grid.find_flat(0).tolist()
+    result = search.bfs(hmap.size, [hmap.endloc], hmap.steps_down(), starts)
+    if verbose > 0:
+        print(f'{len(starts)} start points, {len(result.order)} cells '
+              'searched')
+    return path_length(result)
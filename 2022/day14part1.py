@@ -11,109 +11,124 @@ Created on Wed Dec 14 05:56:30 2022
 
 @author: rpoepa
 """
-import time
-import numpy as np
 
-tic = time.perf_counter()
-Infinity = 99999  # Use for "impossibly large integer"
-# First read in the rock paths
-rockpaths = []
-with open('input/input.2022day14.txt', 'r') as f:
-#with open('input/test.2022day14.txt', 'r') as f:
-    for line in f:
-        pathstr = line.strip().replace('->',' ').split()
-        path = []
-        for pair in pathstr:
-            xy = pair.split(',')
-            path.append([int(xy[0]), int(xy[1])])
-        rockpaths.append(path)
+verbose = 0
+infile = 'input/input.2022day14.txt'
+#infile = 'input/test.2022day14.txt'
 
-# Determine limits of the grid
-xmin = Infinity
-xmax = -Infinity
-ymin = Infinity
-ymax = -Infinity
-for path in rockpaths:
-    for xy in path:
-        xmin = min(xmin, xy[0])
-        xmax = max(xmax, xy[0])
-        ymin = min(ymin, xy[1])
-        ymax = max(ymax, xy[1])
+Infinity = 99999  # Use for "impossibly large integer"
 
-ymin = 0   # Force extra rows at the top
+# -1, 0 or 1. (numpy.sign, without importing numpy for it)
+def sign(x):
+    return (x > 0) - (x < 0)
 
-# Convenience function for coordinate transformation
-xy_to_ij = lambda xy: (xy[1] - ymin, xy[0] - xmin)
+# The rock map as a list of rows of characters, and the offsets of the
+# grid from (x, y) coordinates
+class RockMap:
+    def __init__(self, grid, xmin, ymin):
+        self.grid = grid
+        self.xmin = xmin
+        self.ymin = ymin
     
-# Build grid and trace paths
-width = xmax - xmin + 1
-height = ymax - ymin + 1
-grid = [['.']*width for _ in range(height)]
-for path in rockpaths:
-    ij0 = xy_to_ij(path[0])
-    for point in path[1:]:
-        ij1 = xy_to_ij(point)
-        di = np.sign(ij1[0] - ij0[0])  # One of these is always 0
-        dj = np.sign(ij1[1] - ij0[1])
-        i = ij0[0]
-        j = ij0[1]
-        while i != ij1[0] or j != ij1[1]:
-            grid[i][j] = '#'
-            i += di
-            j += dj
-        grid[ij1[0]][ij1[1]] = '#'  # Add the endpoint
-        ij0 = ij1
-
-
-#for row in grid:
-#    print(''.join(row))
-toc = time.perf_counter()
-
-print(f'Time to build map = {(toc - tic) * 1000} ms')
+    # Convenience function for coordinate transformation
+    def xy_to_ij(self, xy):
+        return (xy[1] - self.ymin, xy[0] - self.xmin)
 
-toc = time.perf_counter()
-# Begin dropping sand.
-into_the_abyss = False
-grains = 0
-while not into_the_abyss:
-    # Create a new grain of sand
-    (i, j) = xy_to_ij([500, 0])
-    grains += 1
-    blocked = False
+def parse(infile):
+    # First read in the rock paths
+    rockpaths = []
+    with open(infile, 'r') as f:
+        for line in f:
+            pathstr = line.strip().replace('->',' ').split()
+            path = []
+            for pair in pathstr:
+                xy = pair.split(',')
+                path.append([int(xy[0]), int(xy[1])])
+            rockpaths.append(path)
     
-    # Dropping logic
-    while not blocked or into_the_abyss:
-        i += 1
-        if i >= height:
-            into_the_abyss = True
-            break
-        if grid[i][j] == '.':
-            continue
+    # Determine limits of the grid
+    xmin = Infinity
+    xmax = -Infinity
+    ymin = Infinity
+    ymax = -Infinity
+    for path in rockpaths:
+        for xy in path:
+            xmin = min(xmin, xy[0])
+            xmax = max(xmax, xy[0])
+            ymin = min(ymin, xy[1])
+            ymax = max(ymax, xy[1])
+    
+    ymin = 0   # Force extra rows at the top
+    
+    # Build grid and trace paths
+    width = xmax - xmin + 1
+    height = ymax - ymin + 1
+    rocks = RockMap([['.']*width for _ in range(height)], xmin, ymin)
+    grid = rocks.grid
+    for path in rockpaths:
+        ij0 = rocks.xy_to_ij(path[0])
+        for point in path[1:]:
+            ij1 = rocks.xy_to_ij(point)
+            di = sign(ij1[0] - ij0[0])  # One of these is always 0
+            dj = sign(ij1[1] - ij0[1])
+            i = ij0[0]
+            j = ij0[1]
+            while i != ij1[0] or j != ij1[1]:
+                grid[i][j] = '#'
+                i += di
+                j += dj
+            grid[ij1[0]][ij1[1]] = '#'  # Add the endpoint
+            ij0 = ij1
+    return rocks
 
-        # Blocked below. Try left.            
-        if j == 0:
-            into_the_abyss = True
-            break
-        if grid[i][j-1] =='.':
-            j -= 1
-            continue
-        
-        # Blocked left. Try right.
-        if j >= width - 1:
-            into_the_abyss = True
-            break
-        
-        if grid[i][j+1] == '.': 
-            j += 1
-            continue
+def part_a(rocks):
+    # The sand is added to the grid. Work on a copy so the parsed input can
+    # be reused.
+    grid = [row.copy() for row in rocks.grid]
+    height = len(grid)
+    width = len(grid[0])
+    
+    # Begin dropping sand.
+    into_the_abyss = False
+    grains = 0
+    while not into_the_abyss:
+        # Create a new grain of sand
+        (i, j) = rocks.xy_to_ij([500, 0])
+        grains += 1
+        blocked = False
         
-        grid[i-1][j] = 'o'
-        blocked = True
-
-grains -= 1  # That last one that fell into the abyss
-toc2 = time.perf_counter()
-print(f'Time to drop {grains} grains of sand = {toc2 - toc} s')
-
-for row in grid:
-    print(''.join(row))
+        # Dropping logic
+        while not blocked or into_the_abyss:
+            i += 1
+            if i >= height:
+                into_the_abyss = True
+                break
+            if grid[i][j] == '.':
+                continue
+    
+            # Blocked below. Try left.            
+            if j == 0:
+                into_the_abyss = True
+                break
+            if grid[i][j-1] =='.':
+                j -= 1
+                continue
             
+            # Blocked left. Try right.
+            if j >= width - 1:
+                into_the_abyss = True
+                break
+            
+            if grid[i][j+1] == '.': 
+                j += 1
+                continue
+            
+            grid[i-1][j] = 'o'
+            blocked = True
+    
+    grains -= 1  # That last one that fell into the abyss
+    
+    if verbose > 0:
+        for row in grid:
+            print(''.join(row))
+    return grains
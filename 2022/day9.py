@@ -9,12 +9,33 @@ to certain rules. Determine how many positions the T visits.
 Part 2. The rope has 10 knots. Each knot follows the knot in front of it using
 the same 2-knot rule as part 1.
 
+Rework: one engine for any number of knots, in NumPy. A knot is always next
+to (or on) the knot ahead of it, at one of 9 offsets, and each step of the
+knot ahead turns the old offset into a new one. Those maps compose, so a
+prefix scan of them (a tree of compositions, up and back down, in 2 log n
+array operations) gives the knot's offset all along, and from that its own
+steps, which drive the next knot.
+
+The steps are kept as runs: a step and how many times in a row. A run of
+the same step, repeated, settles within a few steps into a state where the
+knot moves in lockstep with the knot ahead. So each run maps to at most a
+few single steps and one long run of the knot behind, and a move like
+"R 4000" costs no more than "R 4". The simulation takes time in proportion
+to the number of moves, not their length. Only at the end are the tail's
+runs expanded into cells (as ranges, a chunk at a time), packed into
+integer keys and counted by sorting.
+
 Created on Fri Dec  9 00:27:31 2022
 
 @author: randyppa
 """
+
 import numpy as np
-import time
+from aoc.parsing import read, ints
+
+infile = 'input/input.2022day9.txt'
+
+CHUNK = 1 << 18     # Tail steps expanded into cells at a time
 
 # Based on current position of head (xh, yh) and tail (xt, yt) determine
 # by the movement rules what the new position of the tail should be.
@@ -46,82 +67,167 @@ def move_tail(xh, yh, xt, yt):
         elif dx < 0:
             xt -= 1
     return (xt, yt)
-        
-
-tic = time.perf_counter()
-with open('input/input.2022day9.txt', 'r') as f:
-    moves = [line.strip().split(' ') for line in f]
-
-toc1 = time.perf_counter()
-
-# Do the moves
-xh = 0
-yh = 0
-xt = 0
-yt = 0
-patht = set()
-patht.add((xt, yt))
-for k, move in enumerate(moves):
-    dist = int(move[1])
-    if move[0] == 'U':
-        dx = 0
-        dy = 1
-    elif move[0] == 'D':
-        dx = 0
-        dy = -1
-    elif move[0] == 'R':
-        dx = 1
-        dy = 0
-    elif move[0] == 'L':
-        dx = -1
-        dy = 0
-
-    for _ in range(dist):
-        xh += dx
-        yh += dy
-        xt, yt = move_tail(xh, yh, xt, yt)
-        patht.add((xt, yt))
-
-toc2 = time.perf_counter()
-print(f'Number of points on tail path = {len(patht)}')
-print(f'Time for load = {(toc1 - tic)*1e6} μs')
-print(f'Time for Part 1 = {(toc2 - toc1)*1000} ms')
-
-toc3 = time.perf_counter()
+
+
+# Unit step for each move direction
+steps = {'U':(0, 1), 'D':(0, -1), 'R':(1, 0), 'L':(-1, 0)}
+
+# Offsets (and unit steps, diagonal or not) are numbered 0 .. 8 by
+# 3 * (dx + 1) + (dy + 1). 4 is (0, 0).
+OFFSETS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+STAY = 4
+
+def offset_index(dx, dy):
+    return 3 * (dx + 1) + (dy + 1)
+
+# FOLLOW[m, s]: the new offset of a knot from the knot ahead, if it was at
+# offset s and the knot ahead takes step m
+def follow_table():
+    table = np.zeros((9, 9), dtype=np.uint8)
+    for s, (sx, sy) in enumerate(OFFSETS.tolist()):
+        for m, (mx, my) in enumerate(OFFSETS.tolist()):
+            # The knot ahead goes from (0, 0) to (mx, my)
+            xt, yt = move_tail(mx, my, sx, sy)
+            table[m, s] = offset_index(xt - mx, yt - my)
+    return table
+
+FOLLOW = follow_table()
+
+# OWN[m, s, t]: a knot's own step, if the knot ahead took step m and the
+# offset went from s to t. (Step ahead + change of offset; combinations
+# that can't happen are clipped to a unit step.)
+def own_table():
+    table = np.zeros((9, 9, 9), dtype=np.intp)
+    offsets = OFFSETS.tolist()
+    for m, (mx, my) in enumerate(offsets):
+        for s, (sx, sy) in enumerate(offsets):
+            for t, (tx, ty) in enumerate(offsets):
+                dx = max(-1, min(1, mx + tx - sx))
+                dy = max(-1, min(1, my + ty - sy))
+                table[m, s, t] = offset_index(dx, dy)
+    return table
+
+OWN = own_table()
+
+# Each move as its unit step and its distance, in arrays
+def parse(infile):
+    raw = read(infile)
+    dists = ints(raw)
+    # The direction is the first letter of each line
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    firsts = np.flatnonzero(buf[:-1] == ord('\n')) + 1
+    letters = buf[np.concatenate(([0], firsts))[:len(dists)]]
+    unit = np.zeros((256, 2), dtype=np.int64)
+    for direction, step in steps.items():
+        unit[ord(direction)] = step
+    return unit[letters], dists
+
+# POWERS[m, j]: the map of offsets for j steps m in a row. After SETTLE
+# steps, more make no difference: the offset has reached a fixed point.
+def power_table():
+    powers = [np.tile(np.arange(9, dtype=np.uint8), (9, 1))]
+    while True:
+        powers.append(np.take_along_axis(FOLLOW, powers[-1], axis=1))
+        if (powers[-1] == powers[-2]).all():
+            return np.stack(powers[:-1], axis=1)
+
+POWERS = power_table()
+SETTLE = POWERS.shape[1] - 1
+
+# The offset after each of a sequence of maps of offsets, given the offset
+# before them
+def scan(maps, offset):
+    n = len(maps)
+    # A tree of the maps: level 0 has the given ones (padded to a power of 2
+    # with the map that changes nothing), and each map of the next level is
+    # two of them in turn.
+    size = 1 << (n - 1).bit_length()
+    padding = np.tile(np.arange(9, dtype=maps.dtype), (size - n, 1))
+    levels = [np.concatenate((maps, padding))]
+    while len(levels[-1]) > 1:
+        maps = levels[-1]
+        levels.append(np.take_along_axis(maps[1::2], maps[0::2], axis=1))
+    # Back down the tree, the offset after each map of a level: after a
+    # pair it's the offset from the level above; after the first of a pair,
+    # apply that map to the offset before the pair.
+    after = levels[-1][:, offset]
+    for maps in reversed(levels[:-1]):
+        before = np.concatenate(([offset], after[:-1]))
+        below = np.empty(len(maps), dtype=maps.dtype)
+        below[1::2] = after
+        below[0::2] = maps[0::2][np.arange(len(after)), before]
+        after = below
+    return after[:n]
+
+# Join neighboring runs of the same step, and drop empty runs and runs of
+# staying put
+def join_runs(steps, counts):
+    keep = (counts > 0) & (steps != STAY)
+    steps = steps[keep]
+    counts = counts[keep]
+    if steps.size == 0:
+        return steps, counts
+    firsts = np.flatnonzero(np.concatenate(([True], steps[1:] != steps[:-1])))
+    return steps[firsts], np.add.reduceat(counts, firsts)
+
+# The runs of steps of a knot, given the runs (step numbers and counts) of
+# the knot ahead and its offset before them. Returns its runs and its offset
+# after them.
+def follow(ahead, counts, offset):
+    n = len(ahead)
+    if n == 0:
+        return ahead, counts, offset
+    settled = np.minimum(counts, SETTLE)
+    after = scan(POWERS[ahead, settled], offset)
+    # The offsets through the first SETTLE steps of each run
+    offsets = np.empty((n, SETTLE + 1), dtype=np.intp)
+    offsets[:, 0] = np.concatenate(([offset], after[:-1]))
+    for j in range(SETTLE):
+        offsets[:, j + 1] = FOLLOW[ahead, offsets[:, j]]
+    # Each run gives up to SETTLE single steps, then one run of the rest,
+    # all the same step (once settled the offset no longer changes)
+    own = np.empty((n, SETTLE + 1), dtype=np.intp)
+    own_counts = np.empty((n, SETTLE + 1), dtype=counts.dtype)
+    for j in range(SETTLE):
+        own[:, j] = OWN[ahead, offsets[:, j], offsets[:, j + 1]]
+        own_counts[:, j] = counts > j
+    own[:, SETTLE] = OWN[ahead, offsets[:, SETTLE], offsets[:, SETTLE]]
+    own_counts[:, SETTLE] = counts - settled
+    own, own_counts = join_runs(own.ravel(), own_counts.ravel())
+    return own, own_counts, int(after[-1])
+
+# The distinct values of an array of keys, sorted. (Sorting is several
+# times faster than np.unique here.)
+def distinct(keys):
+    keys = np.sort(keys)
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+# Number of positions the last of nknots visits
+def tail_visits(moves, nknots):
+    dirs, dists = moves
+    knot, counts = join_runs(offset_index(dirs[:, 0], dirs[:, 1]), dists)
+    for k in range(1, nknots):
+        # Every knot starts on the one ahead
+        knot, counts, _ = follow(knot, counts, STAY)
+    # Expand the tail's runs into the cells it visits
+    tail = np.zeros(2, dtype=np.int64)
+    visited = [np.zeros(1, dtype=np.int64)]     # Packed (0, 0)
+    ends = np.cumsum(counts)
+    first = 0
+    while first < len(knot):
+        done = ends[first - 1] if first > 0 else 0
+        last = min(int(np.searchsorted(ends, done + CHUNK)) + 1, len(knot))
+        path = tail + np.cumsum(np.repeat(OFFSETS[knot[first:last]],
+                                          counts[first:last], axis=0), axis=0)
+        tail = path[-1]
+        visited.append(distinct((path[:, 0] << 32) + path[:, 1]))
+        first = last
+    return len(distinct(np.concatenate(visited)))
+
+# Part 1: 2 knots
+def part_a(moves):
+    return tail_visits(moves, 2)
 
 # Part 2: 10 knots (head + 9 followers)
-knots = [(0,0)] * 10
-patht10 = set()
-patht10.add(knots[9])
-for k, move in enumerate(moves):
-    dist = int(move[1])
-    if move[0] == 'U':
-        dx = 0
-        dy = 1
-    elif move[0] == 'D':
-        dx = 0
-        dy = -1
-    elif move[0] == 'R':
-        dx = 1
-        dy = 0
-    elif move[0] == 'L':
-        dx = -1
-        dy = 0
-
-    xh, yh = knots[0]
-    for _ in range(dist):
-        xh += dx
-        yh += dy
-        knots[0] = (xh, yh)
-        for k in range(1,10):
-            knots[k] = move_tail(knots[k-1][0], knots[k-1][1], 
-                                 knots[k][0], knots[k][1])
-        patht10.add(knots[9])
-
-toc4 = time.perf_counter()
-print(f'Number of points on tail path for 10-knot rope = {len(patht10)}')
-print(f'Time for part 2 = {(toc4 - toc3)*1000} ms')
-
-
-
-    
\ No newline at end of file
+def part_b(moves):
+    return tail_visits(moves, 10)
@@ -23,62 +23,35 @@ infile = 'input/day01.' + ('sample' if sample else 'input') + '.txt'
 #=======================================
 #  Functions and data structures
 
-from collections import defaultdict
+import numpy as np
+from aoc.parsing import read, line_ints
 
 def count_items(list_in):
     # Count unique items in the input list.
-    # Return the unique items as a set and the counts as a default_dict
-    counts = defaultdict(int)
-    unique_items = set()
-    for x in list_in:
-        counts[x] += 1
-        unique_items.add(x)
-    return unique_items, counts
+    # Return the unique items and their counts, as sorted arrays
+    return np.unique(list_in, return_counts=True)
 
 #=======================================
 
-#======== Begin main program =========
-import time
-
-with open(infile, 'r') as fin:
-    lines = fin.readlines()
-
-tic = time.perf_counter()
-
 #=========== parsing =======
-
-list_a = []
-list_b = []
-# Note for future parsing, this from Stack Overflow
-# s = 'a.b....c......d.ef...g'
-# sp = re.compile('\.+').split(s)
-# print(sp)
-for line in lines:
-    vals = line.split()
-    list_a.append(int(vals[0]))
-    list_b.append(int(vals[1]))
+# The two lists are the columns of one NumPy array, read in bulk.
+def parse(infile):
+    return line_ints(read(infile), signed=True).table()
 
 #======== The work =========
 
-list_a.sort()
-list_b.sort()
-
-# Part A
-dist = 0
-for pair in zip(list_a, list_b):
-    dist += abs(pair[0] - pair[1])
-tocA = time.perf_counter()
-print(f'Part A: Total distance = {dist}')
-print(f'Execution time = {(tocA - tic) * 1000} ms ')
-
-# Part B
-items_a, counters_a = count_items(list_a)
-items_b, counters_b = count_items(list_b)
-similarity = 0
-for val in items_a:
-    similarity += val * counters_a[val] * counters_b[val]
-tocB = time.perf_counter()
-print(f'Part B: Total similarity = {similarity}')
-print(f'Execution time = {(tocB - tocA) * 1000} ms ')
-print(f'Total execution time = {(tocB - tic) * 1000} ms ')
-
+# Part A: Total distance
+def part_a(lists):
+    list_a = np.sort(lists[:, 0])
+    list_b = np.sort(lists[:, 1])
+    return int(np.abs(list_a - list_b).sum())
+
+# Part B: Total similarity
+def part_b(lists):
+    items_a, counts_a = count_items(lists[:, 0])
+    items_b, counts_b = count_items(lists[:, 1])
+    # Find each item of list a among the items of list b
+    where = np.searchsorted(items_b, items_a).clip(max=len(items_b) - 1)
+    found = items_b[where] == items_a
+    similarity = items_a[found] * counts_a[found] * counts_b[where[found]]
+    return int(similarity.sum())
@@ -21,78 +21,65 @@ infile = 'input/day02.' + ('sample' if sample else 'input') + '.txt'
 #=======================================
 #  Functions and data structures
 
-# Check a sequence against the "safe" rules
-def is_safe(seq):
+import numpy as np
+from aoc.reader import Source
+from aoc.parsing import line_ints
+
+BLOCK = 1 << 20     # Bytes of input parsed at a time
+
+# Check sequences against the "safe" rules. The reports are the rows of a
+# 2-D array (all of the same length); returns an array of True / False.
+def safe_rows(table):
     # Rules:
     #   1. Must be either all decreasing or all increasing
     #   2. Jump between entries must be 1, 2, or 3
-    delta = [seq[k] - seq[k-1] for k in range(1, len(seq))]
-    signs = [d >= 0 for d in delta]
-    # Check for a change of sign
-    if any(signs) and not all(signs):
-        return False
-    # If decreasing, flip the signs of the deltas
-    if not signs[0]:
-        delta = [-d for d in delta]
-    # Check magnitude of deltas
-    for d in delta:
-        if d < 1 or d > 3:
-            return False
-    return True
-        
-# Attempt correction of unsafe sequence
-def is_safe_if_dampened(seq):
-    n = len(seq)
-    for k in range(n):
-        seq1 = seq.copy()
-        seq1.pop(k)
-        if is_safe(seq1):
-            return True
-        
-    return False
+    delta = np.diff(table, axis=1)
+    increasing = ((delta >= 1) & (delta <= 3)).all(axis=1)
+    decreasing = ((delta <= -1) & (delta >= -3)).all(axis=1)
+    return increasing | decreasing
+
+# Attempt correction of unsafe sequences, by deleting each entry in turn
+def safe_if_dampened(table):
+    safe = np.zeros(len(table), dtype=bool)
+    for k in range(table.shape[1]):
+        safe |= safe_rows(np.delete(table, k, axis=1))
+    return safe
+
+def show(table, safe):
+    for report, ok in zip(table.tolist(), safe):
+        print(*report, ': ', 'SAFE' if ok else 'NOT SAFE')
 #=======================================
 
-#======== Begin main program =========
-import time
-
-with open(infile, 'r') as fin:
-    lines = fin.readlines()
-
-tic = time.perf_counter()
-
 #=========== parsing =======
-reports = []
-for line in lines:
-    vals = [int(x) for x in line.split()]
-    reports.append(vals)
+# Nothing is read here. Each part streams the file a block at a time, and
+# parses each block in bulk, so the input can be any size.
+def parse(infile):
+    return Source(infile)
 
+# The reports of each block, as 2-D arrays of reports of the same length
+def reports(source):
+    for block in source.blocks(BLOCK):
+        for _, table in line_ints(block, signed=True).groups():
+            yield table
 
 #======== The work =========
-safe_count = 0
-for report in reports:
-    safe = is_safe(report)
-    if verbose > 0:
-        print(*report, ': ', 'SAFE' if safe else 'NOT SAFE')
-    if safe:
-        safe_count += 1
-
-tocA = time.perf_counter()
-print(f'Part A: Safe count = {safe_count}')
-print(f'Execution time = {(tocA - tic) * 1000} ms ')
-
-#  Part B
-safe_count = 0
-for report in reports:
-    safe = is_safe(report)
-    if not safe:
-        safe = is_safe_if_dampened(report)
-    if verbose > 0:
-        print(*report, ': ', 'SAFE' if safe else 'NOT SAFE')
-    if safe:
-        safe_count += 1
-
-tocB = time.perf_counter()
-print(f'Part B: Safe count = {safe_count}')
-print(f'Execution time = {(tocB - tocA) * 1000} ms ')
-print(f'Total execution time = {(tocB - tic) * 1000} ms ')
-
+# Part A: Safe count
+def part_a(source):
+    safe_count = 0
+    for table in reports(source):
+        safe = safe_rows(table)
+        if verbose > 0:
+            show(table, safe)
+        safe_count += int(safe.sum())
+    return safe_count
+
+#  Part B: Safe count with the dampener
+def part_b(source):
+    safe_count = 0
+    for table in reports(source):
+        safe = safe_rows(table)
+        safe[~safe] = safe_if_dampened(table[~safe])
+        if verbose > 0:
+            show(table, safe)
+        safe_count += int(safe.sum())
+    return safe_count
@@ -21,58 +21,58 @@ infile = 'input/day03.' + ('sample' if sample else 'input') + '.txt'
 
 #=======================================
 #  Functions and data structures
+import re
+from aoc.reader import Source
     
 #=======================================
 
-#======== Begin main program =========
-import time
-import re
-
-if sample:
-    lines = r"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64]" + \
-        r"(mul(11,8)undo()?mul(8,5))"
-else:
-    with open(infile, 'r') as fin:
-        lines = fin.read()
-
-
 #=========== parsing =======
 
-# Extract all numeric arguments
+# Nothing is read here. The parts run the regular expression over the
+# memory-mapped file, so the input can be any size.
+def parse(infile):
+    if sample:
+        return rb"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64]" + \
+            rb"(mul(11,8)undo()?mul(8,5))"
+    return Source(infile)
+
+# Extract all numeric arguments, one pair at a time. text is bytes or a
+# memory-mapped file.
 def parse_it(text, part='A'):
     # Part A: Only mul(n,n) is accepted
-    valid_str = 'mul\(\d+,\d+\)'
+    valid_str = rb'mul\((\d+),(\d+)\)'
     # Part B: Also accept "do" or "don't" calls
     if part == 'B':
-        valid_str += "|do\(\)|don\'t\(\)"
+        valid_str += rb"|do\(\)|don\'t\(\)"
         
-    # Extract all properly formed instructions
-    instr = re.findall(valid_str, text)
-    
     # Get the product factors, processing dos and don'ts using "enabled"
     # flag to turn on/off parsing
-    factors = []
     enabled = True
-    for token in instr:
-        if token == 'do()':
+    for match in re.finditer(valid_str, text):
+        token = match.group(0)
+        if token == b'do()':
             enabled = True
-        elif token == "don\'t()":
+        elif token == b"don\'t()":
             enabled = False
         elif enabled:
-            factors.append([int(x) for x in re.findall('\d+', token)])
-    return factors
+            yield int(match.group(1)), int(match.group(2))
 
-#args = [[int(x) for x in re.findall('\d+', func_call)] for func_call in instr]
 #======== The work =========
 
-for part in ['A', 'B']:
-    tic = time.perf_counter()
-    args = parse_it(lines, part = part)
+def mul_total(data, part):
+    if isinstance(data, bytes):     # The sample
+        return sum_products(data, part)
+    with data.mapped() as text:
+        return sum_products(text, part)
+
+def sum_products(text, part):
     total = 0
-    for pair in args:
+    for pair in parse_it(text, part = part):
         total += pair[0] * pair[1]
-    
-    toc = time.perf_counter()
-    
-    print(f'Part {part}: Total = {total}')
-    print(f'Execution time = {(toc - tic) * 1000} ms ')
+    return total
+
+def part_a(text):
+    return mul_total(text, 'A')
+
+def part_b(text):
+    return mul_total(text, 'B')
@@ -22,7 +22,6 @@ verbose = 1
 sample = False
 infile = 'input/day05.' + ('sample' if sample else 'input') + '.txt'
 
-import time
 import itertools as it
 from collections import defaultdict
 import functools
@@ -30,9 +29,14 @@ import functools
 #=======================================
 #  Functions and data structures
 
+# Default for rules not in the table. (A named function rather than a
+# lambda, so the table can be pickled.)
+def in_order():
+    return '<'
+
 # Class to implement the numbers are "pages" with the custom ordering.
 class Page():
-    rules = defaultdict(lambda: '<')
+    rules = defaultdict(in_order)
     # rules is a dictionary whose keys are tuples (a, b). If the value is '>'
     # then a > b, and if the value is '<' then a < b.
     # By using a defaultdict, unspecified pairs will always return '<', meaning
@@ -66,6 +70,18 @@ class Page():
     def __ge__(self, other):
         return self > other or self == other
     
+# The parsed input: the rule table and the print orders. The rules are
+# stored here as well as in the Page class, so they go along with the
+# orders when the parsed input is cached.
+class PrintQueue:
+    def __init__(self, rules, print_orders):
+        self.rules = rules
+        self.print_orders = print_orders
+    
+    # Make these rules the ones the Page comparisons use
+    def use_rules(self):
+        Page.rules = self.rules
+
 # Check for any pair found in the rule dictionary with a value of '>'.
 # That indicates a pair in the wrong order
 def check_order(order):
@@ -85,60 +101,53 @@ def cmp(a, b):
 
 #=======================================
 
-#======== Begin main program =========
-
-with open(infile, 'r') as fin:
-    lines = fin.readlines()
-
-tic = time.perf_counter()
-
 #=========== parsing =======
-
-
-print_orders = []
-first_part = True
-for line in lines:
-    line = line.strip()
-    if first_part:
-        vals = line.split('|')
-        if len(vals) == 2:
-            nums = [int(x) for x in vals]
-            Page.add_pair(nums)
+def parse(infile):
+    with open(infile, 'r') as fin:
+        lines = fin.readlines()
+    
+    # Start from an empty rule table, so rules from an earlier input don't
+    # carry over
+    Page.rules = defaultdict(in_order)
+    print_orders = []
+    first_part = True
+    for line in lines:
+        line = line.strip()
+        if first_part:
+            vals = line.split('|')
+            if len(vals) == 2:
+                nums = [int(x) for x in vals]
+                Page.add_pair(nums)
+            else:
+                first_part = False
+                continue
         else:
-            first_part = False
-            continue
-    else:
-        nums = [Page(int(x)) for x in line.split(',')]
-        print_orders.append(nums)
+            nums = [Page(int(x)) for x in line.split(',')]
+            print_orders.append(nums)
+    return PrintQueue(Page.rules, print_orders)
 
 #======== The work =========
-total = 0
-wrong_orders = []
-for order in print_orders:
-    if check_order(order):
+# Part A: Total of middle values of the orders that are correct
+def part_a(queue):
+    queue.use_rules()
+    print_orders = queue.print_orders
+    total = 0
+    for order in print_orders:
+        if check_order(order):
+            n = len(order)
+            middle_value = order[(n - 1)//2].value
+            total += middle_value
+    return total
+
+# Part B: Sort the orders that were incorrect
+def part_b(queue):
+    queue.use_rules()
+    print_orders = queue.print_orders
+    wrong_orders = [order for order in print_orders if not check_order(order)]
+    total = 0
+    for order in wrong_orders:
+        order = sorted(order, key=functools.cmp_to_key(cmp))
         n = len(order)
         middle_value = order[(n - 1)//2].value
         total += middle_value
-    else:
-        wrong_orders.append(order) # Store for Part B
-
-tocA = time.perf_counter()
-print(f'Part A: Total of middle values = {total}')
-print(f'{len(wrong_orders)} were in the wrong order')
-print(f'Execution time = {(tocA - tic) * 1000} ms ')
-
-# Part B: Sort the orders that were incorrect
-total = 0
-for order in wrong_orders:
-    order.sort(key=functools.cmp_to_key(cmp))
-    n = len(order)
-    middle_value = order[(n - 1)//2].value
-    total += middle_value
-
-tocB = time.perf_counter()
-print(f'Part B: Total of middle values = {total}')
-print(f'Execution time = {(tocB - tocA) * 1000} ms ')
-print(f'Total execution time = {(tocB - tic) * 1000} ms ')
-   
-    
-    
\ No newline at end of file
+    return total
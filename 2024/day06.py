@@ -23,6 +23,9 @@ infile = 'input/day06.' + ('sample' if sample else 'input') + '.txt'
 
 #=======================================
 #  Functions and data structures
+import copy
+from aoc import progress, counters
+
 class Vrow:
     # A virtual row, represented as a sequence of runs.
     def __init__(self, width):
@@ -40,6 +43,7 @@ class Vgrid:
         self.visited = set()    # Points that have been visited
         self.path = []
         self.loop = False
+        self.startpos = None    # Where the guard starts
     
     def add_block(self, row, col):
         if row in self.blocks_by_row.keys():
@@ -125,6 +129,7 @@ class Vgrid:
             
             path.append(pathnode)
             curpos, off_grid, direction = pathnode
+        counters.count('path segments', len(path))
         self.path = path.copy()
         return
         
@@ -147,79 +152,69 @@ class Vgrid:
             
 #=======================================
 
-#======== Begin main program =========
-import time
-
-with open(infile, 'r') as fin:
-    lines = fin.readlines()
-
-tic = time.perf_counter()
-
 #=========== parsing =======
-nrows = len(lines)
-ncols = len(lines[0].strip())
-grid = Vgrid(nrows, ncols)
-
-for row,line in enumerate(lines):
-    line = line.strip()
-    for col,elem in enumerate(line):
-        if elem == '#':
-            grid.add_block(row, col)
-        elif elem == '^':
-            startpos = (row, col)
-
-
-for irow in range(nrows):
-    row = Vrow(ncols)
-
+def parse(infile):
+    with open(infile, 'r') as fin:
+        lines = fin.readlines()
+    
+    nrows = len(lines)
+    ncols = len(lines[0].strip())
+    grid = Vgrid(nrows, ncols)
+    
+    for row,line in enumerate(lines):
+        line = line.strip()
+        for col,elem in enumerate(line):
+            if elem == '#':
+                grid.add_block(row, col)
+            elif elem == '^':
+                grid.startpos = (row, col)
+    return grid
 
 #======== The work =========
 
-# Follows the walking rules until path goes off the edge or infinite loop
-# detected. Modifies grid.path
-grid.find_path(startpos, 'N')
-
-# Create the set of visited pixels from the path
-grid.mark_path()
-
-
-tocA = time.perf_counter()
-print(f'Part A: Path had {len(grid.path)} segments')
-print(f'Total points visited = {len(grid.visited)}')
-print(f'Execution time = {(tocA - tic) * 1000} ms ')
+def part_a(grid):
+    # The walk modifies the grid. Work on a copy so the parsed input can be
+    # reused.
+    grid = copy.deepcopy(grid)
+    
+    # Follows the walking rules until path goes off the edge or infinite loop
+    # detected. Modifies grid.path
+    grid.find_path(grid.startpos, 'N')
+    
+    # Create the set of visited pixels from the path
+    grid.mark_path()
+    if verbose > 0:
+        print(f'Part A: Path had {len(grid.path)} segments')
+    # Total points visited
+    return len(grid.visited)
 
 # Part B: Find all positions such that putting a new block there will
 # create a loop.
 #
 # Assert: Such a position has to be one of the visited nodes. Otherwise
 # the path will never intersect it.
-
-grid.add_block(7,6)
-grid.find_path(startpos, 'N')
-grid.remove_block(7,6)
-
-grid.add_block(7,7)
-grid.find_path(startpos, 'N')
-grid.remove_block(7,7)
-
-candidates = grid.visited
-# Don't block the starting position, there's somebody standing there!
-candidates.remove(startpos)
-
-solution = []
-for candidate in candidates:
-    grid.add_block(candidate[0], candidate[1])
+def part_b(grid):
+    grid = copy.deepcopy(grid)
+    startpos = grid.startpos
     grid.find_path(startpos, 'N')
-    if grid.loop:
-        solution.append(candidate)
-    grid.remove_block(candidate[0], candidate[1])
-
-
-tocB = time.perf_counter()
-print(f'Part B: Found {len(solution)} locations that create loops')
-if verbose > 0:
-    for soln in solution:
-        print(soln)
-print(f'Execution time = {(tocB - tocA) * 1000} ms ')
-print(f'Total execution time = {(tocB - tic) * 1000} ms ')
-
+    grid.mark_path()
+    
+    candidates = grid.visited
+    # Don't block the starting position, there's somebody standing there!
+    candidates.remove(startpos)
+    
+    solution = []
+    progress.total(len(candidates))
+    for candidate in candidates:
+        progress.step()
+        grid.add_block(candidate[0], candidate[1])
+        grid.find_path(startpos, 'N')
+        if grid.loop:
+            solution.append(candidate)
+        grid.remove_block(candidate[0], candidate[1])
+    
+    if verbose > 0:
+        for soln in solution:
+            print(soln)
+    # Number of locations that create loops
+    return len(solution)
@@ -23,6 +23,7 @@ Efficiency ideas:
 """
 
 import itertools as it
+from aoc import progress, counters
 
 verbose = 1
 sample = False
@@ -98,43 +99,40 @@ class Equation:
     
 #=======================================
 
-#======== Begin main program =========
-import time
-
-with open(infile, 'r') as fin:
-    lines = fin.readlines()
-
-tic = time.perf_counter()
-
 #=========== parsing =======
-eqns = []
-for line in lines:
-    vals = line.strip().split()
-    result = int(vals[0][:-1])
-    nums = [int(x) for x in vals[1:]]
-    eqns.append( Equation(nums, result) )
+def parse(infile):
+    with open(infile, 'r') as fin:
+        lines = fin.readlines()
+    
+    eqns = []
+    for line in lines:
+        vals = line.strip().split()
+        result = int(vals[0][:-1])
+        nums = [int(x) for x in vals[1:]]
+        eqns.append( Equation(nums, result) )
+    return eqns
 
 #======== The work =========
-toc = []
-for part in ['A', 'B']:
+# Total calibration value of the equations that can be made true
+def calibrate(eqns, operators):
     calibration = 0
+    progress.total(len(eqns))
     for eqn in eqns:
+        progress.step()
         eqn.clear_invalid()
         nargs = len(eqn.arguments)
-        if part == 'A':
-            operators = ['*', '+']
-        else:
-            operators = ['*', '+', '||']
-        for ops in it.product(operators, repeat = nargs - 1):
+        for tried, ops in enumerate(it.product(operators,
+                                               repeat = nargs - 1), 1):
             eqn.operators = ops
             eqn.eval(lazy=True)
             if eqn.truth:
                 calibration += eqn.rhs
                 break
-    toc.append(time.perf_counter())
-    print(f'Part {part}: Total calibration value = {calibration}')
+        counters.count('combinations', tried)
+    return calibration
 
-print(f'Execution time part A = {toc[0] - tic} s ')
-print(f'Execution time part B = {toc[1] - toc[0]} s ')
-print(f'Total execution time = {toc[1] - tic} s ')
+def part_a(eqns):
+    return calibrate(eqns, ['*', '+'])
 
+def part_b(eqns):
+    return calibrate(eqns, ['*', '+', '||'])
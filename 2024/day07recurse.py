@@ -20,6 +20,7 @@ check whether the last number coukd have been added, multiplied or concatenated.
 """
 
 import itertools as it
+from aoc import progress
 
 verbose = 0
 sample = False
@@ -105,8 +106,8 @@ class Equation:
                 self.truth = False
                 return
             if result > self.rhs and lazy:
+                # Can't happen for a solution found by solve()
                 self.truth = False
-                self.mark_invalid(self.operators[:index+1])
                 return
             
         self.truth = result == self.rhs
@@ -114,40 +115,34 @@ class Equation:
     
 #=======================================
 
-#======== Begin main program =========
-import time
-
-with open(infile, 'r') as fin:
-    lines = fin.readlines()
-
-tic = time.perf_counter()
-
 #=========== parsing =======
-eqns = []
-for line in lines:
-    vals = line.strip().split()
-    result = int(vals[0][:-1])
-    nums = [int(x) for x in vals[1:]]
-    eqns.append( Equation(nums, result) )
+def parse(infile):
+    with open(infile, 'r') as fin:
+        lines = fin.readlines()
+    
+    eqns = []
+    for line in lines:
+        vals = line.strip().split()
+        result = int(vals[0][:-1])
+        nums = [int(x) for x in vals[1:]]
+        eqns.append( Equation(nums, result) )
+    return eqns
 
 #======== The work =========
-toc = []
-for part in ['A', 'B']:
+# Total calibration value of the equations that can be made true
+def calibrate(eqns, operators):
     calibration = 0
+    progress.total(len(eqns))
     for eqn in eqns:
-        nargs = len(eqn.arguments)
-        if part == 'A':
-            operators = ['*', '+']
-        else:
-            operators = ['*', '+', '||']
+        progress.step()
         if eqn.solve(operators):
             eqn.eval(lazy=True)  # Check that it's a solution'
             if eqn.truth:
                 calibration += eqn.rhs
-    toc.append(time.perf_counter())
-    print(f'Part {part}: Total calibration value = {calibration}')
+    return calibration
 
-print(f'Execution time part A = {toc[0] - tic} s ')
-print(f'Execution time part B = {toc[1] - toc[0]} s ')
-print(f'Total execution time = {toc[1] - tic} s ')
+def part_a(eqns):
+    return calibrate(eqns, ['*', '+'])
 
+def part_b(eqns):
+    return calibrate(eqns, ['*', '+', '||'])
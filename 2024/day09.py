@@ -19,6 +19,9 @@ infile = 'input/day09.' + ('sample' if sample else 'input') + '.txt'
 
 #=======================================
 #  Functions and data structures
+import copy
+import numpy as np
+
 class Block:
     def __init__(self, startsector, nsectors, id):
         self.startsector = startsector
@@ -51,133 +54,136 @@ class Block:
             total += sectorno * self.id
         return total
     
+# The disk: a map of sector contents (-1 = free), the lists of free and used
+# sectors, and the lists of used and free blocks
+class Disk:
+    def __init__(self):
+        self.diskmap = None
+        self.freelist = None
+        self.usedlist = None
+        self.usedblocks = []
+        self.freeblocks = []
+
 # Debug stuff
-def print_freeblocks():
-    for block in freeblocks:
+def print_freeblocks(disk):
+    for block in disk.freeblocks:
         print(block)
     
-def print_usedblocks():
-    for block in usedblocks:
+def print_usedblocks(disk):
+    for block in disk.usedblocks:
         print(block)
 
-def print_allblocks():
-    print_freeblocks()
-    print_usedblocks()
+def print_allblocks(disk):
+    print_freeblocks(disk)
+    print_usedblocks(disk)
 #=======================================
 
-#======== Begin main program =========
-import time
-import numpy as np
-
-with open(infile, 'r') as fin:
-    lines = fin.readlines()
-
-tic = time.perf_counter()
-
 #=========== parsing =======
-blocks = [int(x) for x in lines[0].strip()]
-nsectors = sum(blocks)
-
-id = 0 
-diskmap = -1 * np.ones((nsectors,),dtype='int')
-free = False
-sectorno = 0
-freelist = []
-usedblocks = []
-freeblocks = []
-for blocksize in blocks:
-    block = Block(sectorno, blocksize, id)
-    if not free:
-        diskmap[sectorno:sectorno + blocksize] = id
-        if blocksize > 0:
-            usedblocks.append(block)
-        id += 1
-    else:
-        block.id = -1
-        if blocksize > 0:
-            freeblocks.append(block)
-    free = not free
-    sectorno += blocksize
-    if verbose > 1:
-        print(block)
+def parse(infile):
+    with open(infile, 'r') as fin:
+        lines = fin.readlines()
     
-# List the free sectors = numbers from 1 to nblocks corresponding to a -1
-# in the diskmap
-sectornos = np.array([x for x in range(nsectors)])
-freelist = sectornos[diskmap == -1]
-usedlist = sectornos[diskmap >= 0]
-if verbose > 1:
-    for block in usedblocks:
-        print(block)
-    for block in freeblocks:
-        print(block)
+    blocks = [int(x) for x in lines[0].strip()]
+    nsectors = sum(blocks)
+    
+    id = 0 
+    disk = Disk()
+    disk.diskmap = -1 * np.ones((nsectors,),dtype='int')
+    diskmap = disk.diskmap
+    free = False
+    sectorno = 0
+    for blocksize in blocks:
+        block = Block(sectorno, blocksize, id)
+        if not free:
+            diskmap[sectorno:sectorno + blocksize] = id
+            if blocksize > 0:
+                disk.usedblocks.append(block)
+            id += 1
+        else:
+            block.id = -1
+            if blocksize > 0:
+                disk.freeblocks.append(block)
+        free = not free
+        sectorno += blocksize
+        if verbose > 1:
+            print(block)
+        
+    # List the free sectors = numbers from 1 to nblocks corresponding to a -1
+    # in the diskmap
+    sectornos = np.array([x for x in range(nsectors)])
+    disk.freelist = sectornos[diskmap == -1]
+    disk.usedlist = sectornos[diskmap >= 0]
+    if verbose > 1:
+        print_allblocks(disk)
+    return disk
 
 #======== The work =========
 # Part A. Disk compression
-lastused = usedlist[-1]
-firstfree = freelist[0]
-if verbose > 0:
-    print(f'firstfree: {firstfree}, lastused = {lastused}')
-while lastused > firstfree:
-    # swap the contents of the last used sector and first free one
-    diskmap[firstfree], diskmap[lastused] = \
-        diskmap[lastused], diskmap[firstfree]
-    # Take that now-used sector off the freelist and add the now-free sector
-    freelist = np.concatenate((freelist[1:],[lastused]))
-    usedlist = np.concatenate(([firstfree],usedlist[:-1]))
+def part_a(disk):
+    # The sectors are swapped in place. Work on a copy so the parsed input
+    # can be reused.
+    diskmap = disk.diskmap.copy()
+    freelist = disk.freelist
+    usedlist = disk.usedlist
     lastused = usedlist[-1]
     firstfree = freelist[0]
     if verbose > 0:
         print(f'firstfree: {firstfree}, lastused = {lastused}')
-
-# Compute checksum
-checksum = sum(diskmap[usedlist] * usedlist)
-
-tocA = time.perf_counter()
-print(f'Part A: checksum = {checksum}')
-print(f'Execution time = {(tocA - tic)*1000} ms')
-
-# Part B: Operate on the freeblocks and usedblocks lists
-# Search used blocks from the right, free blocks from the left
-for block in usedblocks[::-1]:
-    # Search for a free block this size with lower sectorno
-    match = None
-    for freeblock in freeblocks:
-        if freeblock > block:
-            break
-        if freeblock < block and freeblock.nsectors >= block.nsectors:
-            match = freeblock
-            break
-    
-    if match is not None:
-        # Do the move
-        # Do we have to worry about merging free sectors into larger ones?
-        # I don't think so. I think we won't be using this region again
-        newfree = Block(block.startsector, block.nsectors, -1)
-        freeblocks.append(newfree)
-        block.startsector = match.startsector
-        if match.nsectors > block.nsectors:  # There's a leftover free block
-            match.startsector += block.nsectors
-            match.nsectors -= block.nsectors
-        else:  # no leftovers
-            freeblocks.remove(match)
+    while lastused > firstfree:
+        # swap the contents of the last used sector and first free one
+        diskmap[firstfree], diskmap[lastused] = \
+            diskmap[lastused], diskmap[firstfree]
+        # Take that now-used sector off the freelist and add the now-free sector
+        freelist = np.concatenate((freelist[1:],[lastused]))
+        usedlist = np.concatenate(([firstfree],usedlist[:-1]))
+        lastused = usedlist[-1]
+        firstfree = freelist[0]
         if verbose > 0:
-            print(f'Moved block with ID = {block.id}')
-            print_allblocks()
-    else:
-        if verbose > 0:
-            print(f'Can\'t move block with ID = {block.id}')
-        
-# Calculate checksum by blocks
-checksum = 0
-for block in usedblocks:
-    checksum += block.checksum()
+            print(f'firstfree: {firstfree}, lastused = {lastused}')
     
-tocB = time.perf_counter()
-print(f'Part B: checksum = {checksum}')
-print(f'Execution time = {(tocB - tocA) * 1000} ms ')
-print(f'Total execution time = {(tocB - tic) * 1000} ms ')
+    # Compute checksum
+    checksum = sum(diskmap[usedlist] * usedlist)
+    return int(checksum)
 
+# Part B: Operate on the freeblocks and usedblocks lists
+def part_b(disk):
+    # The blocks are moved in place. Work on a copy so the parsed input can
+    # be reused.
+    disk = copy.deepcopy(disk)
+    usedblocks = disk.usedblocks
+    freeblocks = disk.freeblocks
+    # Search used blocks from the right, free blocks from the left
+    for block in usedblocks[::-1]:
+        # Search for a free block this size with lower sectorno
+        match = None
+        for freeblock in freeblocks:
+            if freeblock > block:
+                break
+            if freeblock < block and freeblock.nsectors >= block.nsectors:
+                match = freeblock
+                break
         
-        
-
+        if match is not None:
+            # Do the move
+            # Do we have to worry about merging free sectors into larger ones?
+            # I don't think so. I think we won't be using this region again
+            newfree = Block(block.startsector, block.nsectors, -1)
+            freeblocks.append(newfree)
+            block.startsector = match.startsector
+            if match.nsectors > block.nsectors:  # There's a leftover free block
+                match.startsector += block.nsectors
+                match.nsectors -= block.nsectors
+            else:  # no leftovers
+                freeblocks.remove(match)
+            if verbose > 0:
+                print(f'Moved block with ID = {block.id}')
+                print_allblocks(disk)
+        else:
+            if verbose > 0:
+                print(f'Can\'t move block with ID = {block.id}')
+            
+    # Calculate checksum by blocks
+    checksum = 0
+    for block in usedblocks:
+        checksum += block.checksum()
+    return checksum
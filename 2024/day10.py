@@ -21,116 +21,65 @@ infile = 'input/day10.' + ('sample' if sample else 'input') + '.txt'
 #=======================================
 #  Functions and data structures
 
-import numpy as np
+from aoc.grid import Grid
+from aoc import search
 
-class Grid:
-    def __init__(self, vals):
-        self.vals = np.array(vals)
-        shape = self.vals.shape
-        self.nrows = shape[0]
-        self.ncols = shape[1]
-        self.trails = {}
+# The trails on a grid of heights. Cells are identified by their flat index
+# in the grid, and the border around the grid never matches a height.
+class TrailMap:
+    def __init__(self, grid):
+        self.grid = grid
+        self.size = grid.flatcells.size
+        # Trails go up by exactly 1 at each step
+        self.uphill = search.grid_steps(grid,
+                                        lambda here, there: there - here == 1)
+        self.peaks = set(grid.find_flat(9).tolist())
     
-    # Utility function: Look up value at specified coordinates. Allow 
-    # out-of-bound coordinates, and return -1
-    def val(self, row, col):
-        if row < 0 or col < 0 or row >= self.nrows or col >= self.ncols:
-            return -1
-        else:
-            return self.vals[row, col]
-    
-    # Utility function: Get the neighboring cells that have a given value
-    def neighbors_by_val(self, row, col, val):
-        nbrs = []
-        if self.val(row - 1, col) == val:
-            nbrs += [(row - 1, col)]
-        if self.val(row + 1, col) == val:
-            nbrs += [(row + 1, col)]
-        if self.val(row, col - 1) == val:
-            nbrs += [(row, col - 1)]
-        if self.val(row, col + 1) == val:
-            nbrs += [(row, col + 1)]
-        return nbrs
-        
-    
-    def trails_from(self, row, col):
-        # Retrieve or create all the trails that start at the given location,
-        # increase by 1 each step, and end at 9
-        # A trail is a list of coordinate pairs.
-        # The return value of this method is a list of trails
-        
-        # Check whether we've already analyzed this 
-        examined = (row, col) in self.trails.keys()
-        if examined:
-            return self.trails[row, col]
-        
-        # Exit condition
-        if self.vals[row, col] == 9:
-            self.trails[row, col] = [[(row, col)]]
-        # Otherwise, recursively find trails beginning with the next higher
-        # value
-        else:
-            self.trails[row, col] = []
-            candidates = self.neighbors_by_val(row, col, self.vals[row, col] + 1)
-            for cand in candidates:
-                subtrails = self.trails_from(cand[0], cand[1])
-                if len(subtrails) > 0:
-                    for subtrail in subtrails:
-                        self.trails[row, col].append( [(row,col)] + subtrail)
-        return self.trails[row, col]
-    
-    # All the known trails beginning with a 0
+    # All the cells with a 0
     @property
     def trailheads(self):
-        rows, cols = np.where(self.vals == 0)
-        coords = [(rows[k], cols[k]) for k in range(len(rows))]
-        heads = []
-        for coord in coords:
-            if len(self.trails_from(coord[0], coord[1])) > 0:
-                heads.append(coord)
-        return heads
+        return self.grid.find_flat(0).tolist()
     
     # Part A scoring algorithm: Count the unique value-9 cells reachable
     # from this cell.
-    def trail_score(self, row, col):
-        if (row, col) not in grid.trails.keys():
-            return 0
-        
-        endpoints = set()
-        trails = grid.trails[row, col]
-        for trail in trails:
-            endpoints.add(trail[-1])
-        return len(endpoints)
+    def trail_score(self, index):
+        reached = search.bfs(self.size, [index], self.uphill).order
+        return len(self.peaks.intersection(reached))
+    
+    # Part B scoring: The number of trails from each cell to a 9. Working
+    # down from the 9s, a cell has the trails of all its uphill neighbors.
+    def ratings(self):
+        ratings = [0] * self.size
+        for index in self.peaks:
+            ratings[index] = 1
+        for height in range(8, -1, -1):
+            for index in self.grid.find_flat(height).tolist():
+                ratings[index] = sum(ratings[nbr]
+                                     for nbr in self.uphill(index))
+        return ratings
         
 #=======================================
 
-#======== Begin main program =========
-import time
-
-with open(infile, 'r') as fin:
-    lines = fin.readlines()
-
-tic = time.perf_counter()
-
 #=========== parsing =======
-val_array = [[int(c) for c in line.strip()] for line in lines]
-grid = Grid(val_array)
+# Heights as numbers, with a border that is never a valid next step
+def parse(infile):
+    return Grid.from_file(infile, fill=255, offset=ord('0'))
 
 #======== The work =========
 
-score = 0
-heads = grid.trailheads
-for head in heads:
-    score += grid.trail_score(head[0], head[1])
-    
-tocA = time.perf_counter()
-print(f'Part A: score = {score}')
-print(f'Execution time = {(tocA - tic) * 1000} ms ')
-rating = 0
-heads = grid.trailheads
-for head in heads:
-    rating += len(grid.trails_from(head[0], head[1]))
-tocB = time.perf_counter()
-print(f'Part B: rating = {rating}')
-print(f'Execution time = {(tocB - tocA) * 1000} ms ')
-print(f'Total execution time = {(tocB - tic) * 1000} ms ')
+# Part A: score
+def part_a(grid):
+    trailmap = TrailMap(grid)
+    score = 0
+    for head in trailmap.trailheads:
+        score += trailmap.trail_score(head)
+    return score
+
+# Part B: rating
+def part_b(grid):
+    trailmap = TrailMap(grid)
+    ratings = trailmap.ratings()
+    rating = 0
+    for head in trailmap.trailheads:
+        rating += ratings[head]
+    return rating
@@ -20,7 +20,12 @@ infile = 'input/day13.' + ('sample' if sample else 'input') + '.txt'
 #=======================================
 #  Functions and data structures
 
-import numpy as np
+import re
+
+# Determinant of the 2 x 2 matrix [[a, b], [c, d]]
+def det2(a, b, c, d):
+    return a * d - b * c
+
 class Machine:
     def __init__(self):
         self.ax = 0
@@ -32,71 +37,59 @@ class Machine:
 #        self.solutions = []
         self.best_soln = None
     
-    def solve(self):
+    def solve(self, offset=0):
         # Algebraic approach. Solve the 2 x 2 linear system
-        # Just for grins, do it with Cramer's Rule instead of invoking too
-        # much of numpy's linalg library
-        A = np.array( [[self.ax, self.bx], [self.ay, self.by]])
-        A1 = np.array( [[self.prizex, self.bx], [self.prizey, self.by]])
-        A2 = np.array( [[self.ax, self.prizex], [self.ay, self.prizey]])
-        detA = np.linalg.det(A)
-        na = np.linalg.det(A1) / detA
-        nb = np.linalg.det(A2) / detA
+        # Just for grins, do it with Cramer's Rule instead of invoking
+        # numpy's linalg library. The determinants are exact integers.
+        # The offset is added to the prize coordinates (Part B)
+        prizex = self.prizex + offset
+        prizey = self.prizey + offset
+        detA = det2(self.ax, self.bx, self.ay, self.by)
         if detA == 0:
             print('Matrix is singular!')
             # This never came up in the data
+            self.best_soln = None
+            return
+        na = det2(prizex, self.bx, prizey, self.by) / detA
+        nb = det2(self.ax, prizex, self.ay, prizey) / detA
         # Check whether solution is an integer by rounding to int and
-        # substituting. (Numerical solution has slight errors)
+        # substituting.
         na = round(na)
         nb = round(nb)
         cost = 3 * na + nb
-        if na * self.ax + nb * self.bx == self.prizex and \
-            na * self.ay + nb * self.by == self.prizey:
+        if na * self.ax + nb * self.bx == prizex and \
+            na * self.ay + nb * self.by == prizey:
                 self.best_soln = (na, nb, cost)
         else:
             self.best_soln = None
             
 #=======================================
 
-#======== Begin main program =========
-import time
-import re
-
-with open(infile, 'r') as fin:
-    lines = fin.readlines()
-
-tic = {}
-tic['A'] = time.perf_counter()
-
 #=========== parsing =======
-machines = []
-lineno = 0
-while lineno < len(lines):
-    machine = Machine()
-    machines.append(machine)
-    nums = re.findall('\d+', lines[lineno])
-    machine.ax = int(nums[0])
-    machine.ay = int(nums[1])
-    nums = re.findall('\d+', lines[lineno + 1])
-    machine.bx = int(nums[0])
-    machine.by = int(nums[1])
-    nums = re.findall('\d+', lines[lineno + 2])
-    machine.prizex = int(nums[0])
-    machine.prizey = int(nums[1])
-    lineno += 4
-#======== The work =========
+# Every machine has 6 numbers: button A's X and Y, button B's, and the
+# prize's. Find them all in one pass over the file, 6 to a machine.
+def parse(infile):
+    with open(infile, 'r') as fin:
+        nums = [int(x) for x in re.findall(r'\d+', fin.read())]
+    
+    machines = []
+    for first in range(0, len(nums) - 5, 6):
+        machine = Machine()
+        machines.append(machine)
+        machine.ax, machine.ay, machine.bx, machine.by, \
+            machine.prizex, machine.prizey = nums[first:first + 6]
+    return machines
 
-toc = {}
-for part in ['A', 'B']:
+#======== The work =========
+# Total cost of all the prizes that can be won. Part B moves every prize
+# by the same offset.
+def total_cost(machines, offset):
     tot_na = 0
     tot_nb = 0
     tot_cost = 0
     nprizes = 0
     for m, machine in enumerate(machines):
-        if part == 'B':
-            machine.prizex += 10000000000000
-            machine.prizey += 10000000000000
-        machine.solve()
+        machine.solve(offset)
         if machine.best_soln is None:
             if verbose > 0:
                 print(f'Machine {m}: No solutions')
@@ -110,12 +103,12 @@ for part in ['A', 'B']:
             tot_cost += cost
             if verbose > 0:
                 print(f'Machine {m}: {na} A + {nb} B, cost = {cost}')
-    
-    toc[part] = time.perf_counter()
-    tic['B'] = toc['A']
-    print(f'Part {part}: # prizes = {nprizes}, cost = {tot_cost}')
-    print(f'Execution time = {(toc[part] - tic[part]) * 1000} ms ')
-
-print(f'Total execution time = {(toc["B"] - tic["A"]) * 1000} ms ')
+    if verbose > 0:
+        print(f'# prizes = {nprizes}')
+    return tot_cost
 
+def part_a(machines):
+    return total_cost(machines, 0)
 
+def part_b(machines):
+    return total_cost(machines, 10000000000000)
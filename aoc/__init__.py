@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+aoc -- shared tooling for the Advent Of Code solutions.
+
+Every day in 2022/ and 2024/ is a module exposing parse(infile), and
+part_a(data) and/or part_b(data). The runner loads them by path, runs each
+phase with warmup and repeats, and reports the timings in one unit (ms).
+
+Usage, from the repository root:
+    python -m aoc run                    # every day
+    python -m aoc run 2024               # every day of one year
+    python -m aoc run 2024/day07 -n 10   # one day, 10 timed repeats
+
+@author: randyppa
+"""
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+Entry point for "python -m aoc".
+"""
+import sys
+from aoc.cli import main
+
+sys.exit(main())
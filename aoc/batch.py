@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+batch.py
+
+Run one day over many inputs in a single process.
+
+The day module is loaded once, so only the first input pays for the import,
+and each input is then parsed and solved with run_once. Results are made
+one input at a time, so they can be streamed as JSON lines while the batch
+is still running.
+
+@author: randyppa
+"""
+
+import os
+import glob
+import json
+import time
+
+from aoc import bench
+
+
+# Input files named by files, directories (every file in it) or glob
+# patterns, sorted and without duplicates
+def expand_inputs(patterns):
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            names = [os.path.join(pattern, name)
+                     for name in os.listdir(pattern)]
+        else:
+            names = glob.glob(pattern)
+        found.extend(name for name in names if os.path.isfile(name))
+    if not found:
+        raise ValueError(f'No input files match {" ".join(patterns)}')
+    return sorted(set(found))
+
+
+class BatchSummary:
+    def __init__(self):
+        self.inputs = 0
+        self.errors = 0
+        self.nbytes = 0
+        self.seconds = 0     # Time spent in the phases
+        self.load = 0        # Time to load the day module
+
+    @property
+    def inputs_per_second(self):
+        return self.inputs / self.seconds if self.seconds > 0 else 0
+
+    @property
+    def mb_per_second(self):
+        return self.nbytes / 1e6 / self.seconds if self.seconds > 0 else 0
+
+
+# Answers are mostly ints, but some are NumPy scalars
+def _plain(obj):
+    if hasattr(obj, 'item'):
+        return obj.item()
+    return str(obj)
+
+
+def to_json(record):
+    return json.dumps(record, default=_plain)
+
+
+# Yields a record for each input, as a dict of plain data. A solver that
+# fails on one input gives a record with an 'error' and the batch goes on.
+def run_batch(day, infiles, summary=None, parts=None):
+    if summary is None:
+        summary = BatchSummary()
+    tic = time.perf_counter()
+    day.module
+    summary.load = time.perf_counter() - tic
+    for infile in infiles:
+        nbytes = os.path.getsize(infile)
+        record = {'day': day.name, 'input': infile, 'bytes': nbytes}
+        tic = time.perf_counter()
+        try:
+            counts = {}
+            times, answers = bench.run_once(day, infile, parts,
+                                            counts=counts)
+        except Exception as err:
+            record['error'] = f'{type(err).__name__}: {err}'
+            summary.errors += 1
+        else:
+            record['answers'] = answers
+            record['ms'] = {phase: seconds * 1000
+                            for phase, seconds in times.items()}
+            if counts:
+                record['counts'] = counts
+        seconds = time.perf_counter() - tic
+        record['total_ms'] = seconds * 1000
+        summary.inputs += 1
+        summary.nbytes += nbytes
+        summary.seconds += seconds
+        yield record
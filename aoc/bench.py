@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+bench.py
+
+Time the phases of a day: parse, part A and part B.
+
+Each repeat parses the input again and runs the parts on that fresh data, so
+the parts never see data left over from an earlier run. Warmup runs are done
+the same way but not recorded.
+
+Memory is measured in one more run under tracemalloc, after the timed ones,
+since tracing every allocation slows the code down several times.
+
+@author: randyppa
+"""
+
+import time
+import statistics
+import tracemalloc
+
+from aoc import counters
+
+
+# Timings of one phase over all the repeats. Times are kept in seconds and
+# reported in ms.
+class PhaseTiming:
+    def __init__(self, phase):
+        self.phase = phase
+        self.times = []
+
+    def add(self, seconds):
+        self.times.append(seconds)
+
+    @property
+    def min(self):
+        return min(self.times) * 1000
+
+    @property
+    def median(self):
+        return statistics.median(self.times) * 1000
+
+    @property
+    def p95(self):
+        # Nearest-rank percentile. With few repeats this is just the max.
+        ordered = sorted(self.times)
+        rank = max(1, -(-95 * len(ordered) // 100))
+        return ordered[rank - 1] * 1000
+
+
+# Memory use of one phase: the peak traced memory above what was allocated
+# when the phase started, the memory still allocated when it ended (for the
+# parse, the parsed data) and the change in the number of allocated blocks.
+class PhaseMemory:
+    def __init__(self, phase, peak, retained, blocks):
+        self.phase = phase
+        self.peak = peak            # Bytes
+        self.retained = retained    # Bytes
+        self.blocks = blocks
+
+    @property
+    def peak_mib(self):
+        return self.peak / (1 << 20)
+
+
+class DayResult:
+    def __init__(self, day, infile):
+        self.day = day
+        self.infile = infile
+        self.timings = {}   # PhaseTiming, keyed by phase name
+        self.answers = {}   # Keyed by part, 'A' or 'B'
+        self.first_answers = {}     # From the first run, warmup or not
+        self.memory = {}    # PhaseMemory, keyed by phase name
+        self.counts = {}    # {name: count} of work done, keyed by phase
+
+    def timing(self, phase):
+        if phase not in self.timings:
+            self.timings[phase] = PhaseTiming(phase)
+        return self.timings[phase]
+
+    # Work counts of each phase with the rate, per second of median time,
+    # as (phase, name, count, rate)
+    def rates(self):
+        rows = []
+        for phase, counts in self.counts.items():
+            seconds = self.timings[phase].median / 1000
+            for name, count in counts.items():
+                rate = count / seconds if seconds > 0 else float('inf')
+                rows.append((phase, name, count, rate))
+        return rows
+
+
+def run_once(day, infile, parts=None, cache=None, counts=None):
+    # Run every phase once, or just the parse and the listed parts. With a
+    # ParseCache, the parsed input is loaded from it if possible (timed as
+    # 'load') and stored in it otherwise. With a counts dict, the work
+    # counts of each phase (see counters.py) are put in it.
+    # Returns {phase: seconds} and {part: answer}
+    times = {}
+    answers = {}
+    data = None
+    for phase, func in day.parts:
+        if parts is not None and phase != 'parse' and phase not in parts:
+            continue
+        if counts is not None:
+            counters.start()
+        tic = time.perf_counter()
+        if phase == 'parse':
+            hit = False
+            if cache is not None:
+                hit, data = cache.load(day, infile)
+            if hit:
+                phase = 'load'
+            else:
+                data = func(infile)
+        else:
+            answers[phase] = func(data)
+        times[phase] = time.perf_counter() - tic
+        if counts is not None:
+            phase_counts = counters.stop()
+            if phase_counts:
+                counts[phase] = phase_counts
+        if phase == 'parse' and cache is not None:
+            cache.store(day, infile, data)
+    return times, answers
+
+
+def measure_memory(day, infile, parts=None):
+    # Run every phase once under tracemalloc, always parsing the input.
+    # Returns {phase: PhaseMemory}
+    memory = {}
+    data = None
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    try:
+        for phase, func in day.parts:
+            if parts is not None and phase != 'parse' and phase not in parts:
+                continue
+            blocks = len(tracemalloc.take_snapshot().traces)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            if phase == 'parse':
+                data = func(infile)
+            else:
+                func(data)
+            current, peak = tracemalloc.get_traced_memory()
+            blocks = len(tracemalloc.take_snapshot().traces) - blocks
+            memory[phase] = PhaseMemory(phase, peak - before,
+                                        current - before, blocks)
+    finally:
+        if not started:
+            tracemalloc.stop()
+    return memory
+
+
+def solve_day(day, infile=None, answers=None):
+    # Run each phase once, for the answers. With an AnswerCache, parts whose
+    # answer is cached are not run, and the input is not parsed at all if
+    # none is needed.
+    # Returns a DayResult and the set of parts whose answer was cached
+    if infile is None:
+        infile = day.default_input()
+    result = DayResult(day, infile)
+    cached = set()
+    missing = []
+    for phase, _ in day.parts:
+        if phase == 'parse':
+            continue
+        hit = False
+        if answers is not None:
+            hit, answer = answers.load(day, phase, infile)
+        if hit:
+            result.answers[phase] = answer
+            cached.add(phase)
+        else:
+            missing.append(phase)
+    if missing:
+        times, found = run_once(day, infile, missing)
+        for phase, seconds in times.items():
+            result.timing(phase).add(seconds)
+        for phase, answer in found.items():
+            result.answers[phase] = answer
+            if answers is not None:
+                answers.store(day, phase, infile, answer)
+        # Keep the parts in order
+        result.answers = {phase: result.answers[phase] for phase, _
+                          in day.parts if phase in result.answers}
+    return result, cached
+
+
+def bench_day(day, infile=None, repeat=5, warmup=1, parts=None, cache=None,
+              memory=False):
+    if infile is None:
+        infile = day.default_input()
+    result = DayResult(day, infile)
+    for run in range(warmup):
+        times, answers = run_once(day, infile, parts, cache)
+        if run == 0:
+            result.first_answers = answers
+    for run in range(repeat):
+        counts = {}
+        times, answers = run_once(day, infile, parts, cache, counts)
+        result.counts = counts
+        for phase, seconds in times.items():
+            result.timing(phase).add(seconds)
+        result.answers = answers
+        if warmup == 0 and run == 0:
+            result.first_answers = answers
+    if memory:
+        result.memory = measure_memory(day, infile, parts)
+    return result
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+budget.py
+
+Run a part in a worker process with a time and memory budget.
+
+The worker parses the input and runs the part (with the usual warmup and
+repeats) and sends back the timings and answers. The runner watches the
+clock and the worker's resident memory, and stops the worker if it goes
+over either budget. Solvers that count their progress (see progress.py)
+then get a report of how far they got.
+
+Resident memory is read from /proc, so the memory budget is only enforced
+on Linux.
+
+@author: randyppa
+"""
+
+import os
+import time
+import multiprocessing
+from multiprocessing.sharedctypes import RawArray
+
+from aoc import days, bench, progress
+
+POLL = 0.02     # Seconds between checks on the worker
+
+
+class BudgetResult:
+    def __init__(self, day, part):
+        self.day = day
+        self.part = part
+        self.status = 'ok'      # 'ok', 'timeout', 'memory' or 'error'
+        self.timings = {}
+        self.answers = {}
+        self.counts = {}
+        self.error = None
+        self.elapsed = 0        # Seconds
+        self.peak_rss = None    # Bytes, if known
+        self.done = 0           # Progress counts at the end
+        self.total = 0
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total > 0 else None
+
+    def describe(self):
+        # What went wrong, for the report
+        if self.status == 'error':
+            return f'failed: {self.error}'
+        if self.status == 'timeout':
+            text = f'timed out after {self.elapsed:.1f} s'
+        elif self.peak_rss is None:
+            text = 'over the memory budget'
+        else:
+            text = f'over the memory budget at ' \
+                f'{self.peak_rss / (1 << 20):.0f} MiB'
+        if self.fraction is None:
+            return text + ' (no progress count)'
+        return text + f' at {self.fraction:.0%} of the work ' \
+            f'({self.done:.0f} of {self.total:.0f})'
+
+
+def _worker(dayname, part, infile, repeat, warmup, shared, conn):
+    progress.enable(shared)
+    try:
+        result = bench.bench_day(days.Day(dayname), infile, repeat=repeat,
+                                 warmup=warmup, parts=[part])
+        conn.send(('ok', result.timings, (result.answers, result.counts)))
+    except MemoryError:
+        conn.send(('memory', None, None))
+    except Exception as err:
+        conn.send(('error', f'{type(err).__name__}: {err}', None))
+    finally:
+        conn.close()
+
+
+def _rss(pid):
+    # Resident memory of a process in bytes, or None if it can't be read
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as fin:
+            return int(fin.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _stop(proc):
+    proc.terminate()
+    proc.join(1)
+    if proc.is_alive():
+        proc.kill()
+        proc.join()
+
+
+# Run one part of a day. time_limit is in seconds and mem_limit in bytes;
+# either may be None for no limit. Both cover the worker's parse, warmup
+# and repeats.
+def run_part(day, part, infile=None, time_limit=None, mem_limit=None,
+             repeat=1, warmup=0):
+    if infile is None:
+        infile = day.default_input()
+    result = BudgetResult(day, part)
+    shared = RawArray('d', 2)
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(
+        target=_worker, daemon=True,
+        args=(day.name, part, infile, repeat, warmup, shared, sender))
+    tic = time.perf_counter()
+    proc.start()
+    sender.close()
+    while not receiver.poll(POLL):
+        result.elapsed = time.perf_counter() - tic
+        rss = _rss(proc.pid)
+        if rss is not None:
+            result.peak_rss = max(rss, result.peak_rss or 0)
+        if time_limit is not None and result.elapsed > time_limit:
+            result.status = 'timeout'
+        elif mem_limit is not None and rss is not None and rss > mem_limit:
+            result.status = 'memory'
+        elif not proc.is_alive() and not receiver.poll():
+            break   # Died without a word, e.g. killed by the OS
+        else:
+            continue
+        # Over budget. Read the counts before stopping the worker.
+        result.done, result.total = shared[0], shared[1]
+        _stop(proc)
+        return result
+    try:
+        message = receiver.recv()
+    except EOFError:
+        message = ('error', None, None)
+    proc.join()
+    if message[0] == 'error' and message[1] is None:
+        message = ('error', f'worker exited with status {proc.exitcode}',
+                   None)
+    result.elapsed = time.perf_counter() - tic
+    result.done, result.total = shared[0], shared[1]
+    status, first, second = message
+    result.status = status
+    if status == 'ok':
+        result.timings = first
+        result.answers, result.counts = second
+    elif status == 'error':
+        result.error = first
+    return result
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+cache.py
+
+Caches of parsed inputs and of answers.
+
+The result of a day's parse() is pickled under a key made from a hash of the
+raw input and a hash of the day's source file and of the aoc modules it
+imports (like aoc.parsing), so editing the solver, its parser or the shared
+code it parses with invalidates its entries. A parse served from the cache is timed as
+its own phase, 'load', so it is never mixed up with real parse times.
+
+Answers are cached the same way, per part, and the oldest answers are
+evicted when the cache grows past its size limit.
+
+Data that can't be pickled is simply not cached.
+
+@author: randyppa
+"""
+
+import os
+import re
+import pickle
+import hashlib
+
+from aoc.days import ROOT
+
+CACHE_DIR = os.path.join(ROOT, '.aoc', 'parsed')
+ANSWER_DIR = os.path.join(ROOT, '.aoc', 'answers')
+ANSWER_LIMIT = 16 << 20     # Bytes
+
+
+def file_hash(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as fin:
+        for chunk in iter(lambda: fin.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _aoc_imports(path):
+    with open(path, 'r') as fin:
+        source = fin.read()
+    names = re.findall(r'^\s*(?:from|import)\s+aoc\.(\w+)', source,
+                       flags=re.MULTILINE)
+    # from aoc import grid, search
+    for imported in re.findall(r'^\s*from\s+aoc\s+import\s+([\w, ]+)',
+                               source, flags=re.MULTILINE):
+        names += [name.strip() for name in imported.split(',')]
+    paths = [os.path.join(ROOT, 'aoc', name + '.py') for name in names]
+    return [path for path in paths if os.path.exists(path)]
+
+
+# The shared aoc modules a day imports, as paths, and the ones they import
+# in turn (aoc.grid uses aoc.parsing, for example)
+def helper_files(day):
+    found = set()
+    todo = _aoc_imports(day.path)
+    while todo:
+        path = todo.pop()
+        if path not in found:
+            found.add(path)
+            todo += _aoc_imports(path)
+    return sorted(found)
+
+
+# Pickled entries in a directory, with hit and miss counts
+class PickleCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._hashes = {}   # File hashes, keyed by (path, mtime, size)
+
+    def _hash(self, path):
+        # Hash each file once per process, unless it changes
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        if key not in self._hashes:
+            self._hashes[key] = file_hash(path)
+        return self._hashes[key]
+
+    # Hash of the day's source and of the aoc modules it imports
+    def source_hash(self, day):
+        sha = hashlib.sha256()
+        for path in [day.path] + helper_files(day):
+            sha.update(self._hash(path).encode())
+        return sha.hexdigest()[:16]
+
+    def _load(self, path):
+        try:
+            with open(path, 'rb') as fin:
+                data = pickle.load(fin)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, data
+
+    def _store(self, path, data):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = path + f'.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'wb') as fout:
+                pickle.dump(data, fout, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError,
+                RecursionError):
+            os.remove(tmp)
+            return False
+        # Atomic, so a parallel run never reads a half-written entry
+        os.replace(tmp, path)
+        return True
+
+
+class ParseCache(PickleCache):
+    def __init__(self, directory=CACHE_DIR):
+        super().__init__(directory)
+
+    def path(self, day, infile):
+        source = self.source_hash(day)
+        data = self._hash(infile)[:16]
+        return os.path.join(self.directory,
+                            f'{day.year}_{day.stem}-{source}-{data}.pickle')
+
+    # Returns (True, data) on a hit and (False, None) on a miss
+    def load(self, day, infile):
+        return self._load(self.path(day, infile))
+
+    def store(self, day, infile, data):
+        return self._store(self.path(day, infile), data)
+
+
+class AnswerCache(PickleCache):
+    def __init__(self, directory=ANSWER_DIR, limit=ANSWER_LIMIT):
+        super().__init__(directory)
+        self.limit = limit      # Bytes
+        self.evicted = 0
+
+    def path(self, day, part, infile):
+        source = self.source_hash(day)
+        data = self._hash(infile)[:16]
+        return os.path.join(self.directory, f'{day.year}_{day.stem}-{part}-'
+                            f'{source}-{data}.pickle')
+
+    # Returns (True, answer) on a hit and (False, None) on a miss
+    def load(self, day, part, infile):
+        path = self.path(day, part, infile)
+        hit, answer = self._load(path)
+        if hit:
+            os.utime(path)      # Recently used, evicted last
+        return hit, answer
+
+    def store(self, day, part, infile, answer):
+        stored = self._store(self.path(day, part, infile), answer)
+        if stored:
+            self.evict()
+        return stored
+
+    def evict(self):
+        # Remove the least recently used answers until the cache fits
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pickle'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.limit:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass    # Evicted by a parallel run
+            total -= size
+            self.evicted += 1
@@ -0,0 +1,550 @@
+# -*- coding: utf-8 -*-
+"""
+cli.py
+
+Command line interface for "python -m aoc".
+
+@author: randyppa
+"""
+
+import os
+import ast
+import sys
+import argparse
+
+from aoc import days, bench, history
+from aoc.cache import ParseCache, AnswerCache
+from aoc.verify import Golden, GOLDEN_FILE
+
+
+def print_result(result):
+    print(f'{result.day}')
+    for part, answer in result.answers.items():
+        text = str(answer)
+        if '\n' in text:    # Part 2 of 2022 day 10 draws a picture
+            print(f'  Part {part}:')
+            for line in text.splitlines():
+                print('    ' + line)
+        else:
+            print(f'  Part {part}: {text}')
+    print(f'  {"phase":<8}{"min":>12}{"median":>12}{"p95":>12}   (ms)')
+    for timing in result.timings.values():
+        print(f'  {timing.phase:<8}{timing.min:>12.3f}'
+              f'{timing.median:>12.3f}{timing.p95:>12.3f}')
+    rates = result.rates()
+    if rates:
+        print(f'  {"phase":<8}{"work":<20}{"count":>12}{"per s":>12}')
+        for phase, name, count, rate in rates:
+            print(f'  {phase:<8}{name:<20}{count:>12}{rate:>12.4g}')
+    if result.memory:
+        print(f'  {"phase":<8}{"peak MiB":>12}{"kept MiB":>12}{"blocks":>12}')
+        for usage in result.memory.values():
+            print(f'  {usage.phase:<8}{usage.peak_mib:>12.3f}'
+                  f'{usage.retained / (1 << 20):>12.3f}{usage.blocks:>12}')
+
+
+# Check the answers of the first and the last run against the golden ones,
+# and against each other. Prints and returns the problems.
+def wrong_answers(result, golden):
+    wrong = golden.check(result.day, result.infile, result.answers)
+    wrong += golden.check(result.day, result.infile, result.first_answers)
+    for part, answer in result.first_answers.items():
+        if part in result.answers and str(answer) != \
+                str(result.answers[part]):
+            wrong.append((part, str(answer), str(result.answers[part])))
+    wrong = sorted(set(wrong))
+    for part, expected, got in wrong:
+        print(f'  WRONG ANSWER: Part {part} gave {got!r}, expected '
+              f'{expected!r}')
+    return wrong
+
+
+# Phases of a result whose peak memory is over the budget, in MiB
+def over_budget(result, budget):
+    return [usage for usage in result.memory.values()
+            if usage.peak_mib > budget]
+
+
+# --set NAME=VALUE arguments as a dict. Values are Python literals, or else
+# strings.
+def parse_settings(pairs):
+    settings = {}
+    for pair in pairs:
+        name, sep, text = pair.partition('=')
+        if not sep:
+            raise SystemExit(f'--set {pair}: expected NAME=VALUE')
+        try:
+            settings[name] = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            settings[name] = text
+    return settings
+
+
+# Apply --set to the selected days
+def configure(selected, pairs):
+    settings = parse_settings(pairs)
+    for day in selected:
+        try:
+            day.configure(settings)
+        except ValueError as err:
+            raise SystemExit(str(err))
+
+
+def cmd_run(args):
+    selected = days.select_days(args.days)
+    if args.input is not None and len(selected) != 1:
+        raise SystemExit('--input needs exactly one day')
+    if args.settings:
+        # The workers load the days afresh, without the settings
+        if args.jobs is not None or args.time_limit is not None or \
+                args.mem_limit is not None:
+            raise SystemExit('--set does not work with -j, -t or --mem-limit')
+        configure(selected, args.settings)
+        # Timings of a variant don't belong in the history, and its parsed
+        # input may differ
+        args.record = False
+        args.cache = False
+    if args.jobs is not None:
+        return run_parallel(selected, args)
+    if args.profile:
+        return run_profile(selected, args)
+    if args.time_limit is not None or args.mem_limit is not None:
+        return run_budgeted(selected, args)
+    cache = ParseCache() if args.cache else None
+    memory = args.memory or args.mem_budget is not None
+    golden = Golden() if args.verify else None
+    failed = []
+    wrong = []
+    for day in selected:
+        result = bench.bench_day(day, args.input, repeat=args.repeat,
+                                 warmup=args.warmup, cache=cache,
+                                 memory=memory)
+        print_result(result)
+        if args.mem_budget is not None:
+            for usage in over_budget(result, args.mem_budget):
+                print(f'  OVER BUDGET: {usage.phase} peaked at '
+                      f'{usage.peak_mib:.3f} MiB')
+                failed.append((day, usage.phase))
+        if golden is not None and wrong_answers(result, golden):
+            # Timings of wrong code are never recorded
+            wrong.append(day)
+            continue
+        if args.record:
+            history.append(history.make_records(result))
+    if cache is not None:
+        print(f'Parse cache: {cache.hits} hits, {cache.misses} misses')
+    status = 0
+    if failed:
+        print(f'{len(failed)} phase(s) over the {args.mem_budget} MiB budget')
+        status = 1
+    if wrong:
+        print(f'{len(wrong)} day(s) gave wrong answers; their timings were '
+              'not recorded')
+        status = 1
+    return status
+
+
+def run_profile(selected, args):
+    from aoc import profiling
+    for day in selected:
+        print(f'{day}')
+        profiles = profiling.profile_day(day, args.input)
+        for phase, (stats, prefix) in profiles.items():
+            print(f'  {phase}: {stats.total_tt * 1000:.3f} ms under cProfile,'
+                  f' stacks in {os.path.relpath(prefix)}.collapsed')
+            print(f'    {"own ms":>10}{"total ms":>10}{"calls":>10}  function')
+            for tt, ct, calls, name in profiling.top_functions(stats,
+                                                               args.top):
+                print(f'    {tt * 1000:>10.3f}{ct * 1000:>10.3f}{calls:>10}'
+                      f'  {name}')
+    return 0
+
+
+def run_budgeted(selected, args):
+    # Each part in its own worker, stopped if it goes over budget. Days
+    # with a part that did not finish are not recorded.
+    from aoc import budget
+    mem_limit = args.mem_limit * (1 << 20) if args.mem_limit else None
+    golden = Golden() if args.verify else None
+    status = 0
+    for day in selected:
+        result = bench.DayResult(day, args.input or day.default_input())
+        problems = []
+        for phase, _ in day.parts:
+            if phase == 'parse':
+                continue
+            part = budget.run_part(day, phase, result.infile,
+                                   args.time_limit, mem_limit,
+                                   repeat=args.repeat, warmup=args.warmup)
+            if part.status != 'ok':
+                problems.append(f'  Part {phase}: {part.describe()}')
+                continue
+            for name, timing in part.timings.items():
+                # Each part parses; keep the parse timing of the first one
+                result.timings.setdefault(name, timing)
+            for name, counts in part.counts.items():
+                result.counts.setdefault(name, counts)
+            result.answers.update(part.answers)
+        result.first_answers = result.answers
+        print_result(result)
+        for problem in problems:
+            print(problem)
+        if problems:
+            status = 1
+        elif golden is not None and wrong_answers(result, golden):
+            status = 1
+        elif args.record:
+            history.append(history.make_records(result))
+    return status
+
+
+def run_parallel(selected, args):
+    # Timings taken under load are not recorded in the history. Imported
+    # here to keep multiprocessing out of the startup of the other commands.
+    from aoc import pool
+    results, (wall, cpu, workers) = pool.run_pool(
+        selected, args.input, repeat=args.repeat, warmup=args.warmup,
+        workers=args.jobs, use_cache=args.cache)
+    golden = Golden() if args.verify else None
+    wrong = 0
+    for result in results:
+        print_result(result)
+        if golden is not None and wrong_answers(result, golden):
+            wrong += 1
+    print(f'{workers} workers: wall clock {wall:.3f} s, '
+          f'summed CPU {cpu:.3f} s, speedup {cpu / wall:.2f}x')
+    if wrong:
+        print(f'{wrong} day(s) gave wrong answers')
+        return 1
+    return 0
+
+
+def cmd_verify(args):
+    golden = Golden(args.golden)
+    selected = days.select_days(args.days)
+    if args.input is not None and len(selected) != 1:
+        raise SystemExit('--input needs exactly one day')
+    wrong = 0
+    unknown = 0
+    accepted = 0
+    for day in selected:
+        result, _ = bench.solve_day(day, args.input)
+        print(f'{day}')
+        expected = golden.expected(day, result.infile)
+        bad = {part for part, _, _ in
+               golden.check(day, result.infile, result.answers)}
+        for part, answer in result.answers.items():
+            if part in bad:
+                status = f'WRONG, expected {expected[part]!r}'
+                wrong += 1
+            elif part in expected:
+                status = 'ok'
+            else:
+                status = 'no golden answer'
+                unknown += 1
+            print(f'  Part {part}: {status}')
+        if args.accept or args.replace:
+            stored = golden.accept(day, result.infile, result.answers,
+                                   replace=args.replace)
+            if stored:
+                print(f'  Accepted Part {", ".join(stored)}')
+                accepted += len(stored)
+    if accepted:
+        golden.save()
+    print(f'{wrong} wrong, {unknown} without a golden answer, '
+          f'{accepted} accepted')
+    return 1 if wrong and not args.replace else 0
+
+
+def cmd_solve(args):
+    answers = AnswerCache(limit=args.cache_size * (1 << 20)) \
+        if args.cache else None
+    selected = days.select_days(args.days)
+    if args.input is not None and len(selected) != 1:
+        raise SystemExit('--input needs exactly one day')
+    for day in selected:
+        result, cached = bench.solve_day(day, args.input, answers)
+        print(f'{day}')
+        for part, answer in result.answers.items():
+            if part in cached:
+                note = '(cached)'
+            else:
+                note = f'({result.timings[part].min:.3f} ms)'
+            text = str(answer)
+            if '\n' in text:
+                print(f'  Part {part}: {note}')
+                for line in text.splitlines():
+                    print('    ' + line)
+            else:
+                print(f'  Part {part}: {text}   {note}')
+    if answers is not None:
+        print(f'Answer cache: {answers.hits} hits, {answers.misses} misses, '
+              f'{answers.evicted} evicted')
+    return 0
+
+
+def cmd_batch(args):
+    from aoc import batch
+    selected = days.select_days([args.day])
+    if len(selected) != 1:
+        raise SystemExit('batch needs exactly one day')
+    infiles = batch.expand_inputs(args.inputs)
+    summary = batch.BatchSummary()
+    fout = open(args.output, 'w') if args.output is not None else sys.stdout
+    try:
+        for record in batch.run_batch(selected[0], infiles, summary):
+            fout.write(batch.to_json(record) + '\n')
+            fout.flush()
+    finally:
+        if fout is not sys.stdout:
+            fout.close()
+    # The summary goes to stderr so that stdout is only JSON lines
+    print(f'{summary.inputs} inputs ({summary.errors} failed) in '
+          f'{summary.seconds:.3f} s after {summary.load * 1000:.1f} ms to '
+          f'load: {summary.inputs_per_second:.1f} inputs/s, '
+          f'{summary.mb_per_second:.3f} MB/s', file=sys.stderr)
+    return 1 if summary.errors > 0 else 0
+
+
+def cmd_compare(args):
+    records = history.load(args.history)
+    revs = history.revisions(records)
+    new_rev = args.new if args.new is not None else (revs[-1] if revs else None)
+    if args.base is not None:
+        base_rev = args.base
+    else:
+        older = [rev for rev in revs if rev != new_rev]
+        base_rev = older[-1] if older else None
+    if base_rev is None or new_rev is None:
+        print('Need timings from two revisions to compare')
+        return 1
+
+    threshold = args.threshold / 100
+    print(f'Comparing {args.metric} times, {base_rev} -> {new_rev}')
+    print(f'  {"day":<20}{"phase":<8}{"before":>12}{"after":>12}'
+          f'{"change":>10}   (ms)')
+    slower = 0
+    for key, before, after, ratio in history.compare(records, base_rev,
+                                                       new_rev, args.metric):
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  SLOWER'
+            slower += 1
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        print(f'  {key[0]:<20}{key[1]:<8}{before[args.metric]:>12.3f}'
+              f'{after[args.metric]:>12.3f}{(ratio - 1) * 100:>+9.1f}%{flag}')
+    print(f'{slower} phase(s) slower by more than {args.threshold}%')
+    return 1 if slower > 0 else 0
+
+
+def cmd_imports(args):
+    from aoc import startup
+    selected = days.select_days(args.days)
+    over = 0
+    print(f'  {"day":<20}{"import":>10}   heaviest imports (ms)')
+    for report in startup.import_reports(selected):
+        heaviest = ', '.join(f'{name} {ms:.1f}'
+                             for name, ms in report.heaviest(args.top))
+        flag = ''
+        if args.budget is not None and report.total > args.budget:
+            flag = '  OVER BUDGET'
+            over += 1
+        print(f'  {report.day.name:<20}{report.total:>10.1f}   '
+              f'{heaviest}{flag}')
+    if args.budget is not None:
+        print(f'{over} day(s) over the {args.budget} ms import budget')
+    return 1 if over > 0 else 0
+
+
+def cmd_scale(args):
+    # Imported here because the generators need numpy
+    from aoc import scaling, generate
+    selected = [day for day in days.select_days(args.days)
+                if (day.year, day.number) in generate.GENERATORS]
+    configure(selected, args.settings)
+    results = []
+    for day in selected:
+        result = scaling.scale_day(day, args.sizes, seed=args.seed,
+                                   repeat=args.repeat, budget=args.budget)
+        results.append(result)
+        print(f'{day}')
+        header = ''.join(f'{str(size) + "x":>12}' for size in args.sizes)
+        print(f'  {"phase":<8}{header}{"k":>8}   (ms)')
+        for phase in days.PHASE_ORDER:
+            if phase not in result.times:
+                continue
+            times = result.times[phase]
+            row = ''.join(f'{times[size] * 1000:>12.3f}' if size in times
+                          else f'{"-":>12}' for size in args.sizes)
+            k = result.exponent(phase)
+            k = f'{k:>8.2f}' if k is not None else f'{"-":>8}'
+            print(f'  {phase:<8}{row}{k}')
+        for part, size in result.skipped.items():
+            print(f'  Part {part}: {size}x and up skipped, over the '
+                  f'{args.budget} s budget')
+        for part, (size, error) in result.errors.items():
+            print(f'  Part {part}: failed at {size}x: {error}')
+    if args.plot is not None and results:
+        scaling.plot(results, args.plot)
+    return 0
+
+
+def cmd_watch(args):
+    from aoc import watch
+    selected = days.select_days([args.day])
+    if len(selected) != 1:
+        raise SystemExit(f'{args.day} matches {len(selected)} days; '
+                         'watch takes one')
+    return watch.watch(selected[0], args.input, args.repeat, args.interval)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='aoc',
+                                     description='Advent Of Code runner')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='run and time the selected days')
+    run.add_argument('days', nargs='*',
+                     help='years, days or files, like 2024 or 2024/day07 '
+                     '(default: all)')
+    run.add_argument('-n', '--repeat', type=int, default=5,
+                     help='timed repeats (default 5)')
+    run.add_argument('-w', '--warmup', type=int, default=1,
+                     help='untimed warmup runs (default 1)')
+    run.add_argument('-i', '--input', help='input file for a single day')
+    run.add_argument('--no-record', dest='record', action='store_false',
+                     help='do not add the timings to the history')
+    run.add_argument('-c', '--cache', action='store_true',
+                     help='load parsed inputs from the cache when possible '
+                     '(timed as "load" instead of "parse")')
+    run.add_argument('--no-verify', dest='verify', action='store_false',
+                     help='do not check the answers against the golden ones '
+                     '(see "verify")')
+    run.add_argument('-m', '--memory', action='store_true',
+                     help='measure peak memory and allocated blocks of each '
+                     'phase in one more run under tracemalloc')
+    run.add_argument('--mem-budget', type=float, metavar='MIB',
+                     help='fail if a phase peaks above this many MiB '
+                     '(implies --memory)')
+    run.add_argument('-t', '--time-limit', type=float, metavar='SECONDS',
+                     help='run each part in a worker process and stop it '
+                     'after this long (covers its parse and repeats)')
+    run.add_argument('--mem-limit', type=float, metavar='MIB',
+                     help='run each part in a worker process and stop it '
+                     'if its resident memory goes over this (Linux only)')
+    run.add_argument('-p', '--profile', action='store_true',
+                     help='profile each phase once with cProfile and a '
+                     'stack sampler instead of timing it')
+    run.add_argument('--top', type=int, default=10,
+                     help='hot functions to list per phase with --profile')
+    run.add_argument('-j', '--jobs', type=int, nargs='?', const=0,
+                     help='run the parts in a process pool of JOBS workers '
+                     '(default: one per CPU); timings are not recorded')
+    run.add_argument('--set', dest='settings', action='append', default=[],
+                     metavar='NAME=VALUE',
+                     help='set a variable of the day modules first, like '
+                     'method=sort (not recorded)')
+    run.set_defaults(func=cmd_run)
+
+    scale = sub.add_parser('scale',
+                           help='time the days on generated inputs of '
+                           'growing size and fit the complexity exponent')
+    scale.add_argument('days', nargs='*',
+                       help='years, days or files (default: all)')
+    scale.add_argument('-s', '--sizes', type=int, nargs='+',
+                       default=[1, 10, 100, 1000],
+                       help='input sizes, as multiples of the official '
+                       'input (default 1 10 100 1000)')
+    scale.add_argument('-b', '--budget', type=float, default=60,
+                       help='skip sizes expected to take longer than this '
+                       'many seconds (default 60)')
+    scale.add_argument('-n', '--repeat', type=int, default=1,
+                       help='timed repeats per size (default 1)')
+    scale.add_argument('--seed', type=int, default=0)
+    scale.add_argument('--plot', help='save a log-log plot to this file '
+                       '(needs matplotlib)')
+    scale.add_argument('--set', dest='settings', action='append', default=[],
+                       metavar='NAME=VALUE',
+                       help='set a variable of the day modules first')
+    scale.set_defaults(func=cmd_scale)
+
+    ver = sub.add_parser('verify',
+                         help='check the answers against the known-correct '
+                         'ones, or accept them as correct')
+    ver.add_argument('days', nargs='*',
+                     help='years, days or files (default: all)')
+    ver.add_argument('-i', '--input', help='input file for a single day')
+    ver.add_argument('--accept', action='store_true',
+                     help='store the answers of parts with no golden answer')
+    ver.add_argument('--replace', action='store_true',
+                     help='store all the answers, replacing golden ones')
+    ver.add_argument('--golden', default=GOLDEN_FILE,
+                     help='golden answers file')
+    ver.set_defaults(func=cmd_verify)
+
+    solve = sub.add_parser('solve',
+                           help='print the answers, running only the parts '
+                           'whose code or input changed since the last solve')
+    solve.add_argument('days', nargs='*',
+                       help='years, days or files (default: all)')
+    solve.add_argument('-i', '--input', help='input file for a single day')
+    solve.add_argument('--no-cache', dest='cache', action='store_false',
+                       help='run every part and do not use the answer cache')
+    solve.add_argument('--cache-size', type=float, default=16, metavar='MIB',
+                       help='evict the oldest answers past this size '
+                       '(default 16)')
+    solve.set_defaults(func=cmd_solve)
+
+    bat = sub.add_parser('batch',
+                         help='run one day over many inputs in one process, '
+                         'writing a JSON line per input')
+    bat.add_argument('day', help='the day, like 2024/day07')
+    bat.add_argument('inputs', nargs='+',
+                     help='input files, directories or glob patterns')
+    bat.add_argument('-o', '--output', help='write the JSON lines to this '
+                     'file instead of stdout')
+    bat.set_defaults(func=cmd_batch)
+
+    wat = sub.add_parser('watch',
+                         help='re-run a day whenever its source or input '
+                         'changes, keeping the parsed input in memory')
+    wat.add_argument('day', help='the day, like 2024/day07')
+    wat.add_argument('-i', '--input', help='input file (default: the '
+                     "day's own)")
+    wat.add_argument('-n', '--repeat', type=int, default=3,
+                     help='timed repeats of each phase (default 3)')
+    wat.add_argument('--interval', type=float, default=0.5, metavar='SECONDS',
+                     help='time between checks for changes (default 0.5)')
+    wat.set_defaults(func=cmd_watch)
+
+    imp = sub.add_parser('imports',
+                         help='time the imports of each day in a fresh '
+                         'interpreter (python -X importtime)')
+    imp.add_argument('days', nargs='*',
+                     help='years, days or files (default: all)')
+    imp.add_argument('-b', '--budget', type=float, metavar='MS',
+                     help='fail if a day takes longer than this to import')
+    imp.add_argument('--top', type=int, default=3,
+                     help='heaviest imports to list per day (default 3)')
+    imp.set_defaults(func=cmd_imports)
+
+    comp = sub.add_parser('compare',
+                          help='compare recorded timings of two revisions')
+    comp.add_argument('base', nargs='?',
+                      help='base revision (default: the one before NEW)')
+    comp.add_argument('new', nargs='?',
+                      help='new revision (default: latest recorded)')
+    comp.add_argument('-t', '--threshold', type=float, default=10,
+                      help='percent slowdown to flag (default 10)')
+    comp.add_argument('-m', '--metric', default='median',
+                      choices=['min', 'median', 'p95', 'peak'])
+    comp.add_argument('--history', default=history.HISTORY_FILE,
+                      help='history file')
+    comp.set_defaults(func=cmd_compare)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+counters.py
+
+Counts of the units of work a solver does, like monkey inspections or
+search nodes expanded, to report throughput (units per second) alongside
+the times.
+
+Solvers call count(name, n). The runner turns counting on around each phase
+with start() and collects the totals with stop(); the rest of the time
+count() only tests a global. Count in bulk where you can (once per search
+or per loop, with the number done) rather than once per operation, so the
+counting itself never shows up in the timings.
+
+@author: randyppa
+"""
+
+_counts = None      # {name: count} while counting, else None
+
+
+def count(name, n=1):
+    if _counts is not None:
+        _counts[name] = _counts.get(name, 0) + n
+
+
+def start():
+    global _counts
+    _counts = {}
+
+
+# Stop counting. Returns the counts since start().
+def stop():
+    global _counts
+    counts = _counts if _counts is not None else {}
+    _counts = None
+    return counts
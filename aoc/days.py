@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+days.py
+
+Find and load the day solvers.
+
+A day is named by its year directory and file stem, like '2024/day07' or
+'2022/day11part2'. Each day module must define parse(infile) and at least one
+of part_a(data) and part_b(data). The module variable "infile" is the default
+input, relative to the year directory.
+
+@author: randyppa
+"""
+
+import os
+import re
+import sys
+import glob
+import importlib.util
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YEARS = ['2022', '2024']
+
+# Phase name and the module function that implements it
+PHASES = [('parse', 'parse'), ('A', 'part_a'), ('B', 'part_b')]
+# Order of phases in reports. 'load' is a parse served from the cache.
+PHASE_ORDER = ['parse', 'load', 'A', 'B']
+
+
+class Day:
+    def __init__(self, name):
+        self.name = name        # Like '2024/day07'
+        self.year, self.stem = name.split('/')
+        self.path = os.path.join(ROOT, self.year, self.stem + '.py')
+        self.modname = f'aoc_{self.year}_{self.stem}'
+        self._module = None
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def number(self):
+        # Puzzle number: 11 for both day11part1 and day11part2
+        return int(re.match(r'day(\d+)', self.stem).group(1))
+
+    def __lt__(self, other):
+        return sort_key(self.name) < sort_key(other.name)
+
+    @property
+    def module(self):
+        # Import on first use. Module names are made unique per year because
+        # both years have a day10.py etc. The module is registered in
+        # sys.modules so that pickle can find its classes.
+        if self._module is None:
+            if self.modname in sys.modules:
+                self._module = sys.modules[self.modname]
+                return self._module
+            spec = importlib.util.spec_from_file_location(self.modname,
+                                                          self.path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[self.modname] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[self.modname]
+                raise
+            self._module = module
+        return self._module
+
+    def reload(self):
+        # Load the module again from its file, e.g. after an edit
+        self._module = None
+        sys.modules.pop(self.modname, None)
+        return self.module
+
+    def configure(self, settings):
+        # Set module variables, like the method to use, before running
+        for name, value in settings.items():
+            if not hasattr(self.module, name):
+                raise ValueError(f'{self.name} has no variable {name}')
+            setattr(self.module, name, value)
+
+    @property
+    def parts(self):
+        # The phases this day implements, as (phase name, function) pairs
+        return [(phase, getattr(self.module, func)) for phase, func in PHASES
+                if hasattr(self.module, func)]
+
+    def default_input(self):
+        return os.path.join(ROOT, self.year, self.module.infile)
+
+
+# Sort so that day9 comes before day10
+def sort_key(name):
+    year, stem = name.split('/')
+    match = re.match(r'day(\d+)', stem)
+    return (year, int(match.group(1)) if match else 0, stem)
+
+
+def all_days():
+    names = []
+    for year in YEARS:
+        for path in glob.glob(os.path.join(ROOT, year, 'day*.py')):
+            stem = os.path.splitext(os.path.basename(path))[0]
+            names.append(year + '/' + stem)
+    return sorted(Day(name) for name in names)
+
+
+# Select days matching command line arguments. An argument can be a year
+# ('2024'), a day ('2024/day07'), a prefix ('2022/day11' matches both parts),
+# or a path to the file ('2024/day07.py').
+def select_days(patterns):
+    days = all_days()
+    if not patterns:
+        return days
+    selected = []
+    for pattern in patterns:
+        pattern = os.path.relpath(os.path.abspath(pattern), ROOT)
+        pattern = pattern.replace(os.sep, '/')
+        if pattern.endswith('.py'):
+            pattern = pattern[:-3]
+        if pattern in YEARS:
+            matches = [day for day in days if day.year == pattern]
+        else:
+            matches = [day for day in days if day.name == pattern]
+            if len(matches) == 0:
+                matches = [day for day in days
+                           if day.name.startswith(pattern)]
+        if len(matches) == 0:
+            raise ValueError(f'No day matches {pattern}')
+        for day in matches:
+            if day not in selected:
+                selected.append(day)
+    return selected
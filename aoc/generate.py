@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+generate.py
+
+Synthetic input generators, one per puzzle, for measuring how the solvers
+scale.
+
+generate(year, number, scale, seed) returns the text of a valid input about
+"scale" times the size of the official input. The base sizes below are
+roughly those of the official inputs. Grids grow by sqrt(scale) in each
+direction, so the number of cells grows by scale. Days that share a puzzle
+(2022 day 11 parts 1 and 2, 2024 day07 and day07recurse) share a generator.
+
+@author: randyppa
+"""
+
+import math
+import random
+import hashlib
+import inspect
+import numpy as np
+
+
+def _side(base, scale):
+    # Grid side length for a grid with scale times the cells
+    return max(1, round(base * math.sqrt(scale)))
+
+
+#=======================================
+#  2022
+
+def gen_2022_day1(scale, rng):
+    # ~250 elves, each carrying a few snacks
+    elves = []
+    for _ in range(250 * scale):
+        elves.append('\n'.join(str(rng.randint(1000, 60000))
+                               for _ in range(rng.randint(1, 15))))
+    return '\n\n'.join(elves) + '\n'
+
+
+def gen_2022_day9(scale, rng):
+    # 2000 moves of 1-19 steps
+    return ''.join(f'{rng.choice("UDLR")} {rng.randint(1, 19)}\n'
+                   for _ in range(2000 * scale))
+
+
+def gen_2022_day10(scale, rng):
+    # ~140 instructions, 240 cycles
+    lines = []
+    for _ in range(140 * scale):
+        if rng.random() < 0.3:
+            lines.append('noop')
+        else:
+            lines.append(f'addx {rng.randint(-10, 10) or 1}')
+    return '\n'.join(lines) + '\n'
+
+
+def gen_2022_day11(scale, rng):
+    # 8 monkeys with prime divisibility tests, ~36 items in total. The
+    # worry levels are all different (50-99 at 1x, as in the official
+    # inputs, and a wider range when scaled up), so no two items move
+    # together.
+    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+    tests = rng.sample(primes, 8)
+    nitems = 36 * scale
+    holdings = [[] for _ in range(8)]
+    for worry in rng.sample(range(50, 50 + max(50, 2 * nitems)), nitems):
+        holdings[rng.randrange(8)].append(str(worry))
+    ops = ['old * old', 'old * 19', 'old * 7', 'old + 6', 'old + 3',
+           'old + 8', 'old + 1', 'old + 2']
+    rng.shuffle(ops)
+    text = []
+    for k in range(8):
+        others = [m for m in range(8) if m != k]
+        iftrue, iffalse = rng.sample(others, 2)
+        text.append(f'Monkey {k}:\n'
+                    f'  Starting items: {", ".join(holdings[k])}\n'
+                    f'  Operation: new = {ops[k]}\n'
+                    f'  Test: divisible by {tests[k]}\n'
+                    f'    If true: throw to monkey {iftrue}\n'
+                    f'    If false: throw to monkey {iffalse}\n')
+    return '\n'.join(text)
+
+
+def gen_2022_day12(scale, rng):
+    # 41 x 173 height map, rising from west to east, with some noise
+    nrows = _side(41, scale)
+    ncols = max(_side(173, scale), 27)
+    lines = []
+    for i in range(nrows):
+        row = []
+        for j in range(ncols):
+            height = j * 26 // ncols - (rng.random() < 0.2)
+            row.append(chr(ord('a') + max(0, height)))
+        lines.append(row)
+    lines[nrows // 2][0] = 'S'
+    lines[nrows // 2][ncols - 1] = 'E'
+    return '\n'.join(''.join(row) for row in lines) + '\n'
+
+
+def _packet(rng, depth):
+    if depth > 3 or rng.random() < 0.4:
+        return str(rng.randint(0, 10))
+    return '[' + ','.join(_packet(rng, depth + 1)
+                          for _ in range(rng.randint(0, 5))) + ']'
+
+
+def gen_2022_day13(scale, rng):
+    # 150 pairs of packets
+    pairs = []
+    for _ in range(150 * scale):
+        pairs.append(f'[{_packet(rng, 1)}]\n[{_packet(rng, 1)}]\n')
+    return '\n'.join(pairs)
+
+
+def gen_2022_day14(scale, rng):
+    # ~150 rock paths under the sand source at (500, 0), ~170 deep
+    depth = _side(170, scale)
+    width = _side(80, scale)
+    lines = []
+    for _ in range(150 * scale):
+        x = rng.randint(500 - width // 2, 500 + width // 2)
+        y = rng.randint(10, depth)
+        points = [(x, y)]
+        for k in range(rng.randint(1, 4)):
+            if k % 2 == 0:
+                x += rng.randint(-8, 8)
+            else:
+                y = min(depth, y + rng.randint(1, 6))
+            points.append((x, y))
+        lines.append(' -> '.join(f'{x},{y}' for x, y in points))
+    return '\n'.join(lines) + '\n'
+
+
+#=======================================
+#  2024
+
+def gen_2024_day1(scale, rng):
+    # 1000 pairs of 5-digit location IDs
+    return ''.join(f'{rng.randint(10000, 99999)}   '
+                   f'{rng.randint(10000, 99999)}\n'
+                   for _ in range(1000 * scale))
+
+
+def gen_2024_day2(scale, rng):
+    # 1000 reports of 5-8 levels, about half of them safe
+    lines = []
+    for _ in range(1000 * scale):
+        n = rng.randint(5, 8)
+        sign = rng.choice([-1, 1])
+        steps = [rng.randint(1, 3 if rng.random() < 0.9 else 5)
+                 for _ in range(n - 1)]
+        # Levels stay at 1 or more: a falling report starts high enough
+        level = rng.randint(1, 90) + (sum(steps) if sign < 0 else 0)
+        levels = [level]
+        for step in steps:
+            level += sign * step
+            levels.append(level)
+        lines.append(' '.join(str(x) for x in levels))
+    return '\n'.join(lines) + '\n'
+
+
+def gen_2024_day3(scale, rng):
+    # ~18000 characters of corrupted memory
+    junk = 'mul(,)do()don\'t()[]{}<>!@#$%^&*_+-=?what who from select how'
+    parts = []
+    length = 0
+    while length < 18000 * scale:
+        r = rng.random()
+        if r < 0.15:
+            token = f'mul({rng.randint(1, 999)},{rng.randint(1, 999)})'
+        elif r < 0.17:
+            token = 'do()'
+        elif r < 0.19:
+            token = "don't()"
+        else:
+            token = ''.join(rng.choice(junk)
+                            for _ in range(rng.randint(1, 8)))
+        parts.append(token)
+        length += len(token)
+    return ''.join(parts) + '\n'
+
+
+def _char_grid(chars, nrows, ncols, seed):
+    gen = np.random.default_rng(seed)
+    codes = np.frombuffer(chars.encode(), dtype=np.uint8)
+    grid = codes[gen.integers(0, len(codes), (nrows, ncols))]
+    return grid
+
+
+def _grid_text(grid):
+    lines = np.full((grid.shape[0], 1), ord('\n'), dtype=np.uint8)
+    return np.hstack((grid.astype(np.uint8), lines)).tobytes().decode()
+
+
+def gen_2024_day4(scale, rng):
+    # 140 x 140 word search
+    side = _side(140, scale)
+    return _grid_text(_char_grid('XMAS', side, side, rng.randrange(1 << 30)))
+
+
+def gen_2024_day5(scale, rng):
+    # 49 pages, all 1176 ordering rules, ~200 updates
+    pages = rng.sample(range(10, 100), 49)
+    rank = {page: k for k, page in enumerate(pages)}
+    rules = [f'{a}|{b}' for k, a in enumerate(pages) for b in pages[k + 1:]]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(200 * scale):
+        update = rng.sample(pages, rng.choice(range(5, 24, 2)))
+        if rng.random() < 0.5:
+            update.sort(key=lambda page: rank[page])
+        updates.append(','.join(str(page) for page in update))
+    return '\n'.join(rules) + '\n\n' + '\n'.join(updates) + '\n'
+
+
+def gen_2024_day6(scale, rng):
+    # 130 x 130 lab with ~6% obstructions and the guard in the middle
+    side = _side(130, scale)
+    gen = np.random.default_rng(rng.randrange(1 << 30))
+    grid = np.where(gen.random((side, side)) < 0.06, ord('#'), ord('.'))
+    grid[side // 2, side // 2] = ord('^')
+    return _grid_text(grid)
+
+
+def gen_2024_day7(scale, rng):
+    # 850 equations of 2-12 numbers. Half are made true by construction.
+    lines = []
+    for _ in range(850 * scale):
+        nums = [rng.randint(1, 999) for _ in range(rng.randint(2, 12))]
+        if rng.random() < 0.5:
+            result = nums[0]
+            for num in nums[1:]:
+                op = rng.choice('+*|')
+                if op == '+':
+                    result += num
+                elif op == '*':
+                    result *= num
+                else:
+                    result = int(str(result) + str(num))
+        else:
+            result = rng.randint(1, 10 ** rng.randint(3, 14))
+        lines.append(f'{result}: ' + ' '.join(str(x) for x in nums))
+    return '\n'.join(lines) + '\n'
+
+
+def gen_2024_day8(scale, rng):
+    # 50 x 50 map with ~4 antennas on each of ~40 frequencies
+    side = _side(50, scale)
+    freqs = [chr(c) for c in range(ord('0'), ord('9') + 1)] + \
+        [chr(c) for c in range(ord('a'), ord('z') + 1)] + \
+        [chr(c) for c in range(ord('A'), ord('Z') + 1)]
+    grid = [['.'] * side for _ in range(side)]
+    for _ in range(160 * scale):
+        grid[rng.randrange(side)][rng.randrange(side)] = \
+            rng.choice(freqs[:40])
+    return '\n'.join(''.join(row) for row in grid) + '\n'
+
+
+def gen_2024_day9(scale, rng):
+    # 20000 digit disk map. Files are never 0 blocks long.
+    digits = []
+    for k in range(20000 * scale - 1):
+        digits.append(str(rng.randint(1 if k % 2 == 0 else 0, 9)))
+    return ''.join(digits) + '\n'
+
+
+def gen_2024_day10(scale, rng):
+    # 50 x 50 topographic map. Diagonal ramps give plenty of trails, and
+    # some noise breaks them up.
+    side = _side(50, scale)
+    gen = np.random.default_rng(rng.randrange(1 << 30))
+    i, j = np.indices((side, side))
+    heights = (i + j) % 10
+    noise = gen.random((side, side)) < 0.2
+    heights[noise] = gen.integers(0, 10, noise.sum())
+    return _grid_text(heights + ord('0'))
+
+
+def gen_2024_day12(scale, rng):
+    # 140 x 140 garden of blocky regions
+    side = _side(140, scale)
+    gen = np.random.default_rng(rng.randrange(1 << 30))
+    blocks = gen.integers(0, 26, (side // 4 + 1, side // 4 + 1))
+    grid = np.repeat(np.repeat(blocks, 4, axis=0), 4, axis=1)[:side, :side]
+    return _grid_text(grid + ord('A'))
+
+
+def gen_2024_day13(scale, rng):
+    # 320 claw machines. About a third have a solution by construction. As
+    # in the official inputs, one button moves more in X and the other more
+    # in Y, so far-off prizes (Part B) are also reached with presses >= 0.
+    machines = []
+    for _ in range(320 * scale):
+        ax = ay = bx = by = 0
+        while (ax - ay) * (bx - by) >= 0:
+            ax, ay = rng.randint(10, 99), rng.randint(10, 99)
+            bx, by = rng.randint(10, 99), rng.randint(10, 99)
+        na, nb = rng.randint(1, 100), rng.randint(1, 100)
+        px, py = na * ax + nb * bx, na * ay + nb * by
+        if rng.random() >= 0.35:
+            # Nudge the prize off the lattice of whole presses, as long as
+            # the exact (fractional) presses stay >= 0
+            det = ax * by - bx * ay
+            while True:
+                qx = px + rng.randint(1, 9)
+                qy = py + rng.randint(1, 9)
+                if (qx * by - bx * qy) * det >= 0 and \
+                        (ax * qy - qx * ay) * det >= 0:
+                    px, py = qx, qy
+                    break
+        machines.append(f'Button A: X+{ax}, Y+{ay}\n'
+                        f'Button B: X+{bx}, Y+{by}\n'
+                        f'Prize: X={px}, Y={py}\n')
+    return '\n'.join(machines)
+
+
+GENERATORS = {
+    ('2022', 1): gen_2022_day1,
+    ('2022', 9): gen_2022_day9,
+    ('2022', 10): gen_2022_day10,
+    ('2022', 11): gen_2022_day11,
+    ('2022', 12): gen_2022_day12,
+    ('2022', 13): gen_2022_day13,
+    ('2022', 14): gen_2022_day14,
+    ('2024', 1): gen_2024_day1,
+    ('2024', 2): gen_2024_day2,
+    ('2024', 3): gen_2024_day3,
+    ('2024', 4): gen_2024_day4,
+    ('2024', 5): gen_2024_day5,
+    ('2024', 6): gen_2024_day6,
+    ('2024', 7): gen_2024_day7,
+    ('2024', 8): gen_2024_day8,
+    ('2024', 9): gen_2024_day9,
+    ('2024', 10): gen_2024_day10,
+    ('2024', 12): gen_2024_day12,
+    ('2024', 13): gen_2024_day13,
+}
+
+
+# A short hash of a generator's source, so inputs written by an older
+# version of it are not reused
+def version(year, number):
+    source = inspect.getsource(GENERATORS[year, number])
+    return hashlib.sha256(source.encode()).hexdigest()[:8]
+
+
+def generate(year, number, scale, seed=0):
+    if (year, number) not in GENERATORS:
+        raise ValueError(f'No generator for {year} day {number}')
+    rng = random.Random(f'{year}-{number}-{scale}-{seed}')
+    return GENERATORS[year, number](scale, rng)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+grid.py
+
+A 2-D grid of small integers in one NumPy array, for the grid puzzles.
+
+The array has a border of "pad" cells on every side, filled with a value
+that can't occur inside, so neighbor lookups never need bounds checks.
+Row and column numbers are always those of the puzzle (0 = first row of the
+input); the border is at -1, -2, ... and nrows, nrows + 1, ...
+
+Two ways to work with it:
+  - Whole-grid operations: shifted(drow, dcol) is a view of the array the
+    same shape as the puzzle grid, offset by (drow, dcol). So
+    grid.shifted(0, 1) == grid.inner is True where a cell equals its
+    eastern neighbor.
+  - Single cells by flat index into the padded array: flat(row, col),
+    rowcol(index), and the offsets of the neighbors in OFFSETS4 / OFFSETS8.
+
+@author: randyppa
+"""
+
+import numpy as np
+
+from aoc import parsing
+
+
+class Grid:
+    def __init__(self, values, pad=1, fill=0, dtype=np.uint8):
+        values = np.asarray(values)
+        self.nrows, self.ncols = values.shape
+        self.pad = pad
+        self.fill = fill
+        self.cells = np.full((self.nrows + 2 * pad, self.ncols + 2 * pad),
+                             fill, dtype=dtype)
+        self.inner[:, :] = values
+        # Flat index offsets of the neighbors: N, E, S, W, then the diagonals
+        # NE, SE, SW, NW
+        stride = self.stride
+        self.OFFSETS4 = [-stride, 1, stride, -1]
+        self.OFFSETS8 = self.OFFSETS4 + [-stride + 1, stride + 1,
+                                         stride - 1, -stride - 1]
+
+    # Read a file of equal-length lines straight into a grid of byte values
+    # (ord of each character). "offset" is subtracted, e.g. ord('0') to get
+    # digits as numbers.
+    @classmethod
+    def from_file(cls, infile, pad=1, fill=0, offset=0):
+        return cls.from_bytes(parsing.read(infile), pad=pad, fill=fill,
+                              offset=offset)
+
+    @classmethod
+    def from_bytes(cls, raw, pad=1, fill=0, offset=0):
+        return cls(parsing.char_grid(raw, offset), pad=pad, fill=fill)
+
+    @property
+    def shape(self):
+        return (self.nrows, self.ncols)
+
+    @property
+    def stride(self):
+        # Distance between rows in flat indices
+        return self.ncols + 2 * self.pad
+
+    @property
+    def inner(self):
+        # View of the grid without the border
+        return self.shifted(0, 0)
+
+    @property
+    def flatcells(self):
+        # 1-D view of the padded array, for flat indices
+        return self.cells.reshape(-1)
+
+    # View offset by (drow, dcol): element [r, c] is cell (r + drow, c + dcol)
+    def shifted(self, drow, dcol):
+        pad = self.pad
+        if abs(drow) > pad or abs(dcol) > pad:
+            raise ValueError(f'shift ({drow}, {dcol}) is larger than the '
+                             f'border of {pad}')
+        return self.cells[pad + drow:pad + drow + self.nrows,
+                          pad + dcol:pad + dcol + self.ncols]
+
+    # Views of the 4 (N, E, S, W) or 8 neighbors
+    def neighbors4(self):
+        return [self.shifted(dr, dc)
+                for dr, dc in [(-1, 0), (0, 1), (1, 0), (0, -1)]]
+
+    def neighbors8(self):
+        return self.neighbors4() + [self.shifted(dr, dc) for dr, dc in
+                                    [(-1, 1), (1, 1), (1, -1), (-1, -1)]]
+
+    def flat(self, row, col):
+        return (row + self.pad) * self.stride + col + self.pad
+
+    def rowcol(self, index):
+        row, col = divmod(index, self.stride)
+        return (row - self.pad, col - self.pad)
+
+    def __getitem__(self, rowcol):
+        return self.cells[rowcol[0] + self.pad, rowcol[1] + self.pad]
+
+    def __setitem__(self, rowcol, value):
+        self.cells[rowcol[0] + self.pad, rowcol[1] + self.pad] = value
+
+    # Flat indices of every inner cell with the given value
+    def find_flat(self, value):
+        rows, cols = np.nonzero(self.inner == value)
+        return (rows + self.pad) * self.stride + cols + self.pad
+
+    # (row, col) of every inner cell with the given value
+    def find(self, value):
+        rows, cols = np.nonzero(self.inner == value)
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    def copy(self):
+        other = Grid.__new__(Grid)
+        other.__dict__.update(self.__dict__)
+        other.cells = self.cells.copy()
+        return other
+
+    def __str__(self):
+        # The inner grid as text, for grids of characters
+        return '\n'.join(row.tobytes().decode() for row in self.inner)
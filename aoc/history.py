@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+history.py
+
+Persistent benchmark history, one JSON record per line.
+
+Every timed phase is stored with the day, the phase, a hash of the input and
+the git revision, so runs of the same input can be compared across commits.
+A revision with uncommitted changes is marked with a '+' suffix.
+
+@author: randyppa
+"""
+
+import os
+import json
+import time
+import hashlib
+import subprocess
+
+from aoc.days import ROOT, PHASE_ORDER, sort_key
+
+HISTORY_FILE = os.path.join(ROOT, '.aoc', 'history.jsonl')
+
+
+def input_hash(infile):
+    sha = hashlib.sha256()
+    with open(infile, 'rb') as fin:
+        for chunk in iter(lambda: fin.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()[:16]
+
+
+def git_revision():
+    # Short hash of HEAD, or 'unknown' outside a git checkout
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                             cwd=ROOT, capture_output=True, text=True,
+                             check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD', '--'],
+                               cwd=ROOT).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return rev + ('+' if dirty else '')
+
+
+def make_records(result, rev=None):
+    if rev is None:
+        rev = git_revision()
+    stamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    digest = input_hash(result.infile)
+    records = []
+    for timing in result.timings.values():
+        records.append({'time': stamp, 'rev': rev, 'day': result.day.name,
+                        'phase': timing.phase, 'input_hash': digest,
+                        'repeat': len(timing.times),
+                        'min': timing.min, 'median': timing.median,
+                        'p95': timing.p95})
+        if timing.phase in result.memory:
+            records[-1]['peak'] = result.memory[timing.phase].peak_mib
+        if timing.phase in result.counts:
+            records[-1]['counts'] = result.counts[timing.phase]
+    return records
+
+
+def append(records, path=HISTORY_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as fout:
+        for record in records:
+            fout.write(json.dumps(record) + '\n')
+
+
+def load(path=HISTORY_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as fin:
+        return [json.loads(line) for line in fin if line.strip()]
+
+
+# Revisions in the order they were first recorded
+def revisions(records):
+    revs = []
+    for record in records:
+        if record['rev'] not in revs:
+            revs.append(record['rev'])
+    return revs
+
+
+# Latest record of each (day, phase, input) for one revision
+def latest(records, rev):
+    found = {}
+    for record in records:
+        if record['rev'] == rev:
+            key = (record['day'], record['phase'], record['input_hash'])
+            found[key] = record
+    return found
+
+
+# Compare two revisions. Returns a list of (key, base, new, ratio) for every
+# phase measured in both, and ratio = new / base of the chosen metric. The
+# peak memory ('peak', in MiB) is only in records of runs with --memory.
+def compare(records, base_rev, new_rev, metric='median'):
+    base = latest([record for record in records if metric in record],
+                  base_rev)
+    new = latest([record for record in records if metric in record], new_rev)
+    rows = []
+    keys = sorted(base.keys() & new.keys(),
+                  key=lambda key: (sort_key(key[0]),
+                                   PHASE_ORDER.index(key[1]), key[2]))
+    for key in keys:
+        before = base[key][metric]
+        after = new[key][metric]
+        ratio = after / before if before > 0 else float('inf')
+        rows.append((key, base[key], new[key], ratio))
+    return rows
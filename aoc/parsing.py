@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+parsing.py
+
+Bulk parsing of whole inputs into NumPy arrays.
+
+Most inputs are lines of integers with some text around them. ints() pulls
+every integer out of a buffer in one pass of array operations, with no
+Python loop over lines or tokens; line_ints() does the same and also keeps
+which line each one came from, as offsets into the array of values (like a
+sparse matrix's row pointers). char_grid() reads a grid of characters as a
+2-D array of bytes.
+
+The buffer can be bytes or anything else with the buffer interface, such as
+a block of a memory-mapped file (see reader.py). Integers are int64; if any
+has more than 18 digits, the array holds Python ints instead (dtype object),
+parsed one at a time. A '-' right before the digits makes a number negative
+only with signed=True, since most inputs use '-' for ranges ("2-4").
+
+@author: randyppa
+"""
+
+import numpy as np
+
+MAX_DIGITS = 18
+
+
+def read(infile):
+    with open(infile, 'rb') as fin:
+        return fin.read()
+
+
+# Values and start positions of the integers in a uint8 array
+def _scan(buf, signed):
+    digits = buf - np.uint8(ord('0'))
+    is_digit = digits < 10
+    # Where a run of digits starts or stops. They alternate: start, end,
+    # start, end ...
+    changes = np.flatnonzero(is_digit[1:] != is_digit[:-1]) + 1
+    if is_digit.size > 0 and is_digit[0]:
+        changes = np.concatenate(([0], changes))
+    if is_digit.size > 0 and is_digit[-1]:
+        changes = np.concatenate((changes, [is_digit.size]))
+    starts = changes[0::2]
+    if starts.size == 0:
+        return np.zeros(0, dtype=np.int64), starts
+    lengths = changes[1::2] - starts
+    longest = lengths.max()
+    if longest > MAX_DIGITS:
+        # Too long for int64: Python ints, one at a time
+        raw = buf.tobytes()
+        values = np.array([int(raw[start:start + length]) for start, length
+                           in zip(starts.tolist(), lengths.tolist())],
+                          dtype=object)
+        return _signs(buf, starts, values, signed), starts
+    # Horner's rule, a digit position at a time across all the numbers:
+    # a loop of at most 18 steps over the numbers, not over the bytes
+    last = buf.size - 1
+    values = digits[starts].astype(np.int64)
+    for k in range(1, longest):
+        following = digits[np.minimum(starts + k, last)]
+        values = np.where(lengths > k, values * 10 + following, values)
+    return _signs(buf, starts, values, signed), starts
+
+
+def _signs(buf, starts, values, signed):
+    if signed:
+        minus = np.zeros(starts.size, dtype=bool)
+        after = starts > 0
+        minus[after] = buf[starts[after] - 1] == ord('-')
+        values[minus] *= -1
+    return values
+
+
+# All the integers in the buffer, in order, as an int64 array
+def ints(raw, signed=False):
+    values, _ = _scan(np.frombuffer(raw, dtype=np.uint8), signed)
+    return values
+
+
+class LineInts:
+    # The integers of each line of a buffer. Line i has the values
+    # values[offsets[i]:offsets[i + 1]].
+    def __init__(self, values, offsets):
+        self.values = values
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.line(i)
+
+    def line(self, i):
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def counts(self):
+        # Number of integers on each line
+        return np.diff(self.offsets)
+
+    def table(self):
+        # The values as a 2-D array with a row per line, for inputs with the
+        # same number of integers on every line. Lines with none (blank
+        # lines) are left out.
+        counts = self.counts
+        counts = counts[counts > 0]
+        if counts.size == 0:
+            return self.values.reshape(0, 0)
+        if (counts != counts[0]).any():
+            raise ValueError('lines have different numbers of integers')
+        return self.values.reshape(-1, counts[0])
+
+    def groups(self):
+        # Lines grouped by how many integers they have, as (line numbers,
+        # 2-D array with a row per line), shortest lines first
+        counts = self.counts
+        for n in np.unique(counts):
+            if n == 0:
+                continue
+            rows = np.flatnonzero(counts == n)
+            index = self.offsets[rows][:, np.newaxis] + np.arange(n)
+            yield rows, self.values[index]
+
+
+def line_ints(raw, signed=False):
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    values, starts = _scan(buf, signed)
+    # Line i ends at newlines[i]; the integers before it are those of lines
+    # 0 .. i
+    ends = np.flatnonzero(buf == ord('\n'))
+    if buf.size > 0 and buf[-1] != ord('\n'):
+        ends = np.append(ends, buf.size)    # Last line with no line end
+    offsets = np.zeros(ends.size + 1, dtype=np.int64)
+    offsets[1:] = np.searchsorted(starts, ends)
+    return LineInts(values, offsets)
+
+
+# A file of equal-length lines as a 2-D array of byte values (ord of each
+# character). "offset" is subtracted, e.g. ord('0') to get digits as
+# numbers. The array may be a read-only view of raw.
+def char_grid(raw, offset=0):
+    raw = bytes(raw).replace(b'\r', b'')
+    ncols = raw.index(b'\n') if b'\n' in raw else len(raw)
+    if not raw.endswith(b'\n'):
+        raw += b'\n'
+    nrows = len(raw) // (ncols + 1)
+    values = np.frombuffer(raw, dtype=np.uint8, count=nrows * (ncols + 1))
+    values = values.reshape(nrows, ncols + 1)[:, :ncols]
+    if offset:
+        values = values - np.uint8(offset)
+    return values
+
+
+#=========== Micro-benchmark =======
+
+def micro_benchmark(nlines=1_000_000, per_line=4, repeat=3, seed=0):
+    import time
+    rng = np.random.default_rng(seed)
+    table = rng.integers(0, 100_000, size=(nlines, per_line))
+    raw = '\n'.join(' '.join(map(str, row)) for row in table.tolist())
+    raw = (raw + '\n').encode()
+    cases = [
+        ('split + int', lambda: [[int(x) for x in line.split()]
+                                 for line in raw.splitlines()]),
+        ('ints', lambda: ints(raw)),
+        ('line_ints', lambda: line_ints(raw)),
+        ('line_ints.table', lambda: line_ints(raw).table()),
+    ]
+    print(f'{nlines} lines of {per_line} integers, {len(raw) / 1e6:.1f} MB,'
+          f' best of {repeat}')
+    print(f'  {"parser":<20}{"ms":>10}{"MB/s":>10}')
+    for name, func in cases:
+        best = None
+        for _ in range(repeat):
+            tic = time.perf_counter()
+            func()
+            seconds = time.perf_counter() - tic
+            best = seconds if best is None else min(best, seconds)
+        print(f'  {name:<20}{best * 1000:>10.1f}'
+              f'{len(raw) / 1e6 / best:>10.1f}')
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m aoc.parsing',
+                                     description='parsing micro-benchmark')
+    parser.add_argument('-l', '--lines', type=int, default=1_000_000)
+    parser.add_argument('-w', '--width', type=int, default=4,
+                        help='integers per line')
+    parser.add_argument('-n', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+    micro_benchmark(args.lines, args.width, args.repeat)
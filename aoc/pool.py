@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+pool.py
+
+Run the whole suite in a process pool.
+
+The days share nothing, and the parts of a day only share the parsed input,
+so every (day, part) is a separate job that parses its own input. Jobs are
+started longest first, using the median times in the history, so the long
+ones don't end up alone at the end. Jobs with no history are assumed long.
+
+@author: randyppa
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from aoc import days, bench, history
+from aoc.cache import ParseCache
+
+
+class Job:
+    def __init__(self, day, part, infile):
+        self.day = day          # Day name, like '2024/day07'
+        self.part = part        # 'A' or 'B'
+        self.infile = infile
+        self.expected = None    # Expected seconds, from the history
+
+    def __str__(self):
+        return f'{self.day} {self.part}'
+
+
+# Worker side. Only names and plain data go through the pool, the module is
+# loaded again in the worker.
+def run_job(dayname, part, infile, repeat, warmup, use_cache):
+    cache = ParseCache() if use_cache else None
+    cpu = time.process_time()
+    tic = time.perf_counter()
+    result = bench.bench_day(days.Day(dayname), infile, repeat=repeat,
+                             warmup=warmup, parts=[part], cache=cache)
+    wall = time.perf_counter() - tic
+    cpu = time.process_time() - cpu
+    return result.timings, result.answers, result.counts, wall, cpu
+
+
+def make_jobs(selected, infile=None):
+    jobs = []
+    for day in selected:
+        dayfile = infile if infile is not None else day.default_input()
+        for phase, _ in day.parts:
+            if phase != 'parse':
+                jobs.append(Job(day.name, phase, dayfile))
+    return jobs
+
+
+# Longest-expected-job-first order
+def schedule(jobs, records):
+    expected = {}
+    for record in records:
+        expected[record['day'], record['phase']] = record['median'] / 1000
+    for job in jobs:
+        if (job.day, job.part) in expected:
+            job.expected = expected[job.day, job.part] + \
+                expected.get((job.day, 'parse'), 0)
+    return sorted(jobs, key=lambda job: -job.expected
+                  if job.expected is not None else -float('inf'))
+
+
+# Run all the jobs. Returns a DayResult per day, in the order of "selected",
+# and a summary of (wall seconds, summed CPU seconds, workers)
+def run_pool(selected, infile=None, repeat=1, warmup=0, workers=None,
+             use_cache=False):
+    if workers is None or workers <= 0:
+        workers = os.cpu_count() or 1
+    jobs = schedule(make_jobs(selected, infile), history.load())
+    results = {day.name: None for day in selected}
+    cpu_total = 0
+    tic = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, job.day, job.part, job.infile,
+                                   repeat, warmup, use_cache): job
+                   for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            timings, answers, counts, wall, cpu = future.result()
+            cpu_total += cpu
+            result = results[job.day]
+            if result is None:
+                day = next(day for day in selected if day.name == job.day)
+                result = bench.DayResult(day, job.infile)
+                results[job.day] = result
+            for phase, timing in timings.items():
+                # Each job parses; keep the parse timing of the first one
+                if phase not in result.timings:
+                    result.timings[phase] = timing
+            result.answers.update(answers)
+            for phase, phase_counts in counts.items():
+                result.counts.setdefault(phase, phase_counts)
+    wall = time.perf_counter() - tic
+    ordered = [results[day.name] for day in selected
+               if results[day.name] is not None]
+    for result in ordered:
+        # Report the phases in the usual order
+        order = days.PHASE_ORDER
+        result.timings = {phase: result.timings[phase] for phase in order
+                          if phase in result.timings}
+        result.answers = {part: result.answers[part] for part in order
+                          if part in result.answers}
+        result.counts = {phase: result.counts[phase] for phase in order
+                         if phase in result.counts}
+    return ordered, (wall, cpu_total, workers)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+profiling.py
+
+Profile the phases of a day without editing the solver.
+
+Each phase is run twice: once under cProfile, for the table of hot
+functions and a .prof file (readable with pstats or snakeviz), and once
+under a sampling profiler that records whole call stacks. The stacks are
+written in the collapsed format ("outer;inner;innermost count" per line)
+that flamegraph.pl, speedscope and inferno read.
+
+@author: randyppa
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+
+from aoc.days import ROOT
+
+PROFILE_DIR = os.path.join(ROOT, '.aoc', 'profile')
+
+
+# Run func(arg). Only the frames below this one are profiled.
+def _call(func, arg):
+    return func(arg)
+
+
+class StackSampler:
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _label(self, frame):
+        code = frame.f_code
+        return (f'{code.co_name} ({os.path.basename(code.co_filename)}'
+                f':{code.co_firstlineno})')
+
+    def _sample(self):
+        frame = sys._current_frames().get(self._target)
+        stack = []
+        while frame is not None and frame.f_code is not _call.__code__:
+            stack.append(self._label(frame))
+            frame = frame.f_back
+        if frame is not None and stack:
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        # Let the sampling thread get in more often than every 5 ms
+        self._switch = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval / 2)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch)
+
+    def write(self, path):
+        with open(path, 'w') as fout:
+            for stack, count in sorted(self.stacks.items()):
+                fout.write(f'{stack} {count}\n')
+
+
+# Profile one phase. Returns (result of the phase, pstats.Stats, sampler)
+def profile_phase(func, arg):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    result = _call(func, arg)
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+    with StackSampler() as sampler:
+        _call(func, arg)
+    return result, stats, sampler
+
+
+# Profile every phase of a day. Writes <day>.<phase>.prof and
+# <day>.<phase>.collapsed to outdir and returns {phase: (stats, path
+# prefix)}.
+def profile_day(day, infile=None, outdir=PROFILE_DIR):
+    if infile is None:
+        infile = day.default_input()
+    os.makedirs(outdir, exist_ok=True)
+    profiles = {}
+    data = None
+    for phase, func in day.parts:
+        arg = infile if phase == 'parse' else data
+        result, stats, sampler = profile_phase(func, arg)
+        if phase == 'parse':
+            data = result
+        prefix = os.path.join(outdir, f'{day.year}_{day.stem}.{phase}')
+        stats.dump_stats(prefix + '.prof')
+        sampler.write(prefix + '.collapsed')
+        profiles[phase] = (stats, prefix)
+    return profiles
+
+
+# The n functions with the most time of their own, as (tottime, cumtime,
+# calls, name) tuples
+def top_functions(stats, n=10):
+    rows = []
+    for (filename, line, name), (cc, nc, tt, ct, callers) in \
+            stats.stats.items():
+        if filename == '~':     # Built-in function
+            label = name
+        else:
+            label = f'{name} ({os.path.basename(filename)}:{line})'
+        rows.append((tt, ct, nc, label))
+    rows.sort(reverse=True)
+    return rows[:n]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+progress.py
+
+Progress counters for long-running parts.
+
+A solver announces how much work a part has with total(n), and calls step()
+as each unit is done (an equation, a round, a candidate). Normally nothing
+is listening and these do nothing but test a global. When the runner gives
+a part a time budget (see budget.py), it runs the part in a worker process
+and passes in shared memory for the counts, so if it has to stop the part
+it can say how far it got.
+
+Call step() in an outer loop, not once per innermost operation.
+
+@author: randyppa
+"""
+
+_shared = None      # [done, total] in shared memory, or None
+
+
+def enable(shared):
+    global _shared
+    _shared = shared
+
+
+def disable():
+    global _shared
+    _shared = None
+
+
+# Start a new count of n units of work
+def total(n):
+    if _shared is not None:
+        _shared[0] = 0
+        _shared[1] = n
+
+
+def step(n=1):
+    if _shared is not None:
+        _shared[0] += n
+
+
+# Fraction done, or None if the part gave no total
+def fraction(shared):
+    done, work = shared[0], shared[1]
+    if work <= 0:
+        return None
+    return done / work
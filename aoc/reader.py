@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+reader.py
+
+Read inputs too big to hold in memory.
+
+The file is memory-mapped, so solvers can run a regular expression over the
+whole of it, or slice it, without copying it into a string; or they can go
+through it a line or a record at a time. Lines are bytes, not str: int(),
+split() and strip() work the same on bytes, and nothing has to be decoded.
+
+A Source is what a streaming day's parse() returns. It only holds the file
+name, so each part makes its own pass over the file in constant memory. It
+can't be pickled, so the parsed-input cache never stores one.
+
+@author: randyppa
+"""
+
+import os
+import mmap
+from contextlib import contextmanager
+
+
+# The file mapped read-only. An empty file gives b'', since it can't be
+# mapped.
+@contextmanager
+def mapped(infile):
+    with open(infile, 'rb') as fin:
+        if os.fstat(fin.fileno()).st_size == 0:
+            yield b''
+            return
+        mm = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+# The file in blocks of whole lines, each about chunk bytes (more if a line
+# is longer), as bytes. For parsing a block at a time with parsing.py.
+def blocks(infile, chunk=1 << 16):
+    with mapped(infile) as mm:
+        start = 0
+        size = len(mm)
+        while start < size:
+            end = mm.find(b'\n', min(start + chunk, size - 1))
+            end = size if end < 0 else end + 1
+            yield mm[start:end]
+            start = end
+
+
+# Lines of the file without the line ends. The map is split a block at a
+# time, which is much faster than readline().
+def lines(infile, chunk=1 << 16):
+    for block in blocks(infile, chunk):
+        yield from block.splitlines()
+
+
+# Groups of lines separated by blank lines, as lists of lines
+def records(infile):
+    record = []
+    for line in lines(infile):
+        if line.strip():
+            record.append(line)
+        elif record:
+            yield record
+            record = []
+    if record:
+        yield record
+
+
+class Source:
+    def __init__(self, infile):
+        self.infile = infile
+
+    def __str__(self):
+        return self.infile
+
+    # A Source is only a file name, not the data, so it must not be cached
+    # as a parsed input: the cache is keyed by the file's contents, and a
+    # copy of the file elsewhere would load a name that may not exist
+    # anymore. Refusing to pickle keeps it out of the cache.
+    def __reduce__(self):
+        raise TypeError('a Source is read lazily and cannot be pickled')
+
+    def blocks(self, chunk=1 << 16):
+        return blocks(self.infile, chunk)
+
+    def lines(self):
+        return lines(self.infile)
+
+    def records(self):
+        return records(self.infile)
+
+    def mapped(self):
+        return mapped(self.infile)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+scaling.py
+
+Scaling benchmark: run each part of a day on generated inputs of growing
+size and fit the empirical complexity exponent k in time ~ size**k.
+
+Sizes are multiples of the official input size (see generate.py). The sizes
+are run smallest first. A size is skipped, along with all larger ones, when
+the time at the previous size, scaled up linearly, would exceed the budget;
+superlinear solvers will overrun that estimate, but never by surprise.
+
+@author: randyppa
+"""
+
+import os
+import math
+
+from aoc import bench, generate
+from aoc.days import ROOT
+
+SIZES = [1, 10, 100, 1000]
+GEN_DIR = os.path.join(ROOT, '.aoc', 'generated')
+
+
+# Path of the generated input, which is written the first time it is needed.
+# The name has the generator's version, so editing it makes new inputs.
+def input_for(day, scale, seed=0):
+    version = generate.version(day.year, day.number)
+    path = os.path.join(GEN_DIR, f'{day.year}_day{day.number:02d}_x{scale}'
+                        f'_s{seed}_{version}.txt')
+    if not os.path.exists(path):
+        os.makedirs(GEN_DIR, exist_ok=True)
+        text = generate.generate(day.year, day.number, scale, seed)
+        tmp = path + f'.{os.getpid()}.tmp'
+        with open(tmp, 'w') as fout:
+            fout.write(text)
+        os.replace(tmp, path)
+    return path
+
+
+# Least squares slope of log(time) against log(size)
+def fit_exponent(sizes, times):
+    points = [(math.log(s), math.log(t)) for s, t in zip(sizes, times)
+              if t > 0]
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mx = sum(x for x, _ in points) / n
+    my = sum(y for _, y in points) / n
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    sxy = sum((x - mx) * (y - my) for x, y in points)
+    return sxy / sxx if sxx > 0 else None
+
+
+class ScalingResult:
+    def __init__(self, day):
+        self.day = day
+        self.times = {}     # {phase: {size: median seconds}}
+        self.skipped = {}   # {phase: first size not run}
+        self.errors = {}    # {phase: (size, error message)}
+
+    def exponent(self, phase):
+        measured = sorted(self.times.get(phase, {}).items())
+        return fit_exponent([s for s, _ in measured], [t for _, t in measured])
+
+
+def scale_day(day, sizes=SIZES, seed=0, repeat=1, budget=60):
+    result = ScalingResult(day)
+    parts = [phase for phase, _ in day.parts if phase != 'parse']
+    # Each part is run on its own, so that one part failing or running out
+    # of budget doesn't stop the others
+    for part in parts:
+        previous = None     # (size, seconds) of the last size run
+        for size in sizes:
+            if previous is not None:
+                predicted = previous[1] * size / previous[0]
+                if predicted > budget:
+                    result.skipped[part] = size
+                    break
+            infile = input_for(day, size, seed)
+            try:
+                run = bench.bench_day(day, infile, repeat=repeat, warmup=0,
+                                      parts=[part])
+            except Exception as err:
+                result.errors[part] = (size, f'{type(err).__name__}: {err}')
+                break
+            total = 0
+            for phase, timing in run.timings.items():
+                seconds = timing.median / 1000
+                result.times.setdefault(phase, {}).setdefault(size, seconds)
+                total += seconds
+            previous = (size, total)
+    return result
+
+
+# Log-log plot of all the phases of the results. Needs matplotlib.
+def plot(results, outfile):
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise SystemExit('--plot needs matplotlib')
+    fig, ax = plt.subplots(figsize=(8, 6))
+    for result in results:
+        for phase, times in result.times.items():
+            measured = sorted(times.items())
+            if len(measured) < 2:
+                continue
+            k = result.exponent(phase)
+            ax.loglog([s for s, _ in measured],
+                      [t * 1000 for _, t in measured], marker='o',
+                      label=f'{result.day} {phase} (k={k:.2f})')
+    ax.set_xlabel('input size (x official)')
+    ax.set_ylabel('median time (ms)')
+    ax.legend(fontsize='small')
+    fig.savefig(outfile)
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+search.py
+
+Graph searches over flat-indexed grids (see grid.py), or any graph whose
+nodes are the integers 0 .. size - 1.
+
+The graph is given as a function neighbors(index): the indices one step
+away for bfs(), or (index, cost) pairs for dijkstra() and astar(). All the
+searches take any number of start nodes (multi-source search) and stop at
+the first goal they reach. For a reverse search, e.g. from the end to the
+nearest of many possible starts, give the neighbors function with the step
+rule turned around.
+
+Distances and predecessors are kept in lists indexed by node, which is much
+faster than dicts keyed by (row, col).
+
+Run "python -m aoc.search" for micro-benchmarks on a random grid.
+
+@author: randyppa
+"""
+
+import heapq
+from collections import deque
+
+import numpy as np
+
+from aoc import counters
+
+UNREACHED = -1
+
+
+class SearchResult:
+    def __init__(self, size):
+        self.dist = [UNREACHED] * size    # Distance from the nearest start
+        self.prev = [UNREACHED] * size    # Predecessor on the shortest path
+        self.order = []                   # Nodes in the order they were done
+        self.found = UNREACHED            # The goal reached, if any
+
+    @property
+    def distance(self):
+        # Distance to the goal, or None if none was reached
+        if self.found == UNREACHED:
+            return None
+        return self.dist[self.found]
+
+    def path(self, end=None):
+        # Nodes on the shortest path from a start to end (default: the goal)
+        if end is None:
+            end = self.found
+        if end == UNREACHED or self.dist[end] == UNREACHED:
+            return []
+        path = [end]
+        while self.prev[path[-1]] != UNREACHED:
+            path.append(self.prev[path[-1]])
+        path.reverse()
+        return path
+
+
+def _goal_set(goals):
+    if goals is None or isinstance(goals, (set, frozenset, dict)):
+        return goals
+    return set(goals)
+
+
+# Breadth-first search, for graphs where every step costs 1
+def bfs(size, starts, neighbors, goals=None):
+    result = SearchResult(size)
+    dist = result.dist
+    prev = result.prev
+    order = result.order
+    goals = _goal_set(goals)
+    queue = deque()
+    for start in starts:
+        if dist[start] == UNREACHED:
+            dist[start] = 0
+            queue.append(start)
+    while queue:
+        index = queue.popleft()
+        order.append(index)
+        if goals is not None and index in goals:
+            result.found = index
+            break
+        step = dist[index] + 1
+        for nbr in neighbors(index):
+            if dist[nbr] == UNREACHED:
+                dist[nbr] = step
+                prev[nbr] = index
+                queue.append(nbr)
+    counters.count('search nodes', len(order))
+    return result
+
+
+# Dijkstra's algorithm with a binary heap. neighbors(index) gives
+# (index, cost) pairs, with cost >= 0.
+def dijkstra(size, starts, neighbors, goals=None):
+    return astar(size, starts, neighbors, goals)
+
+
+# A* search. heuristic(index) must never overestimate the distance to the
+# nearest goal; without one this is Dijkstra's algorithm. A heuristic that
+# is admissible but not consistent can find a shorter way to a node that is
+# already done: the node is then reopened (and is in result.order again).
+def astar(size, starts, neighbors, goals=None, heuristic=None):
+    result = SearchResult(size)
+    dist = result.dist
+    prev = result.prev
+    order = result.order
+    goals = _goal_set(goals)
+    heap = []
+    for start in starts:
+        dist[start] = 0
+        estimate = heuristic(start) if heuristic is not None else 0
+        heap.append((estimate, 0, start))
+    heapq.heapify(heap)
+    while heap:
+        _, d, index = heapq.heappop(heap)
+        if d > dist[index]:
+            continue    # An older, longer entry for the node
+        order.append(index)
+        if goals is not None and index in goals:
+            result.found = index
+            break
+        for nbr, cost in neighbors(index):
+            step = d + cost
+            if dist[nbr] == UNREACHED or step < dist[nbr]:
+                dist[nbr] = step
+                prev[nbr] = index
+                estimate = step + (heuristic(nbr) if heuristic is not None
+                                   else 0)
+                heapq.heappush(heap, (estimate, step, nbr))
+    counters.count('search nodes', len(order))
+    return result
+
+
+# Connected components of the given nodes. Returns a list of the component
+# number of every node (UNREACHED for nodes not given) and the number of
+# components.
+def components(size, nodes, neighbors):
+    labels = [UNREACHED] * size
+    count = 0
+    for node in nodes:
+        if labels[node] != UNREACHED:
+            continue
+        labels[node] = count
+        stack = [node]
+        while stack:
+            index = stack.pop()
+            for nbr in neighbors(index):
+                if labels[nbr] == UNREACHED:
+                    labels[nbr] = count
+                    stack.append(nbr)
+        count += 1
+    counters.count('search nodes', len(nodes))
+    return labels, count
+
+
+# A neighbors function for a Grid: the cells next to a cell (diagonals too
+# if diagonal) for which can_step(values here, values there) is true. The
+# grid's border value should fail can_step, so the search stays inside.
+# can_step is called once per direction on whole arrays (of int64, so
+# differences don't wrap around), so it must use & and | rather than "and"
+# and "or". The search then only looks up the answers.
+def grid_steps(grid, can_step, diagonal=False):
+    values = grid.flatcells.astype(np.int64)
+    offsets = grid.OFFSETS8 if diagonal else grid.OFFSETS4
+    allowed = []
+    for offset in offsets:
+        # there[i] is values[i + offset]. It wraps around at the ends, but
+        # only for border cells, which are never searched from.
+        there = np.roll(values, -offset)
+        allowed.append((offset, can_step(values, there).tolist()))
+
+    def neighbors(index):
+        return [index + offset for offset, ok in allowed if ok[index]]
+    return neighbors
+
+
+# Like grid_steps, with a cost of 1 per step, for dijkstra() and astar()
+def grid_costs(grid, can_step, diagonal=False):
+    steps = grid_steps(grid, can_step, diagonal)
+
+    def neighbors(index):
+        return [(nbr, 1) for nbr in steps(index)]
+    return neighbors
+
+
+#=========== Micro-benchmarks =======
+
+def _random_grid(side, walls, seed):
+    # Open cells are 1, walls 0, and the border 0
+    import random
+    from aoc.grid import Grid
+    rng = random.Random(seed)
+    rows = [bytes(1 if rng.random() >= walls else 0 for _ in range(side))
+            for _ in range(side)]
+    grid = Grid([list(row) for row in rows], fill=0)
+    start = grid.flat(0, 0)
+    goal = grid.flat(side - 1, side - 1)
+    grid.flatcells[start] = grid.flatcells[goal] = 1
+    return grid, start, goal
+
+
+def micro_benchmark(side=300, walls=0.2, repeat=5, seed=0):
+    import time
+    grid, start, goal = _random_grid(side, walls, seed)
+    size = grid.flatcells.size
+    open_cell = lambda here, there: there == 1
+    steps = grid_steps(grid, open_cell)
+    costs = grid_costs(grid, open_cell)
+    goal_row, goal_col = grid.rowcol(goal)
+
+    def manhattan(index):
+        row, col = grid.rowcol(index)
+        return abs(goal_row - row) + abs(goal_col - col)
+
+    cells = grid.find_flat(1).tolist()
+    cases = [
+        ('bfs', lambda: bfs(size, [start], steps)),
+        ('bfs to goal', lambda: bfs(size, [start], steps, [goal])),
+        ('dijkstra', lambda: dijkstra(size, [start], costs)),
+        ('dijkstra to goal', lambda: dijkstra(size, [start], costs, [goal])),
+        ('astar to goal', lambda: astar(size, [start], costs, [goal],
+                                        manhattan)),
+        ('components', lambda: components(size, cells, steps)),
+    ]
+    print(f'{side} x {side} grid, {walls:.0%} walls, best of {repeat}')
+    print(f'  {"search":<20}{"ms":>10}{"cells/s":>14}{"visited":>10}')
+    for name, func in cases:
+        best = None
+        for _ in range(repeat):
+            tic = time.perf_counter()
+            result = func()
+            seconds = time.perf_counter() - tic
+            best = seconds if best is None else min(best, seconds)
+        if isinstance(result, SearchResult):
+            visited = len(result.order)
+        else:
+            visited = len(cells)
+        print(f'  {name:<20}{best * 1000:>10.3f}'
+              f'{visited / best:>14,.0f}{visited:>10}')
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m aoc.search',
+                                     description='search micro-benchmarks')
+    parser.add_argument('-s', '--side', type=int, default=300)
+    parser.add_argument('-w', '--walls', type=float, default=0.2)
+    parser.add_argument('-n', '--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    micro_benchmark(args.side, args.walls, args.repeat, args.seed)
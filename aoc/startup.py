@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+startup.py
+
+Measure what importing a day costs, the way "python -X importtime" does.
+
+Each day is loaded in a fresh interpreter with -X importtime, and the load
+is also timed as a whole, since day modules are executed from their files
+and so do not show up in the -X importtime output themselves. Modules that a
+bare run of the loader also imports are left out, so the report is the time
+spent on the day module and whatever it pulls in.
+
+@author: randyppa
+"""
+
+import sys
+import subprocess
+
+from aoc.days import ROOT
+
+LOADER = 'import time\nfrom aoc.days import Day\n'
+# Load the day and print how long that took, in us
+LOAD_DAY = ('tic = time.perf_counter()\n'
+            'Day({name!r}).module\n'
+            'print(round((time.perf_counter() - tic) * 1e6))\n')
+
+
+# Top-level imports in -X importtime output, as {module: cumulative us}.
+# Lines look like "import time:  self | cumulative | <indent>name" and
+# top-level modules have no indent.
+def _top_level(stderr):
+    found = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line.split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue    # The header
+        name = fields[2][1:]
+        if not name.startswith(' '):
+            found[name] = int(fields[1])
+    return found
+
+
+# Run code with -X importtime. Returns its output and the top-level imports.
+def _importtime(code):
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return proc.stdout, _top_level(proc.stderr)
+
+
+class ImportReport:
+    def __init__(self, day, load, modules):
+        self.day = day
+        self.load = load        # us to load the day, imports included
+        self.modules = modules  # {module: cumulative us}
+
+    @property
+    def total(self):
+        # Milliseconds
+        return self.load / 1000
+
+    def heaviest(self, n=3):
+        # The n slowest imports, as (name, ms)
+        ordered = sorted(self.modules.items(), key=lambda item: -item[1])
+        return [(name, us / 1000) for name, us in ordered[:n]]
+
+
+def import_report(day, baseline=None):
+    # baseline is the set of modules the loader imports on its own
+    if baseline is None:
+        baseline = set(_importtime(LOADER)[1])
+    output, found = _importtime(LOADER + LOAD_DAY.format(name=day.name))
+    return ImportReport(day, int(output.split()[-1]),
+                        {name: us for name, us in found.items()
+                         if name not in baseline})
+
+
+def import_reports(selected):
+    baseline = set(_importtime(LOADER)[1])
+    return [import_report(day, baseline) for day in selected]
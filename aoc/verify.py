@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+verify.py
+
+Known-correct ("golden") answers, to check every run against.
+
+Answers are kept per day and per input, keyed by the input hash, in one JSON
+file. They are stored as text, since some answers are NumPy integers and
+one is a picture. An input with no golden answers can't be checked; accept
+the answers of a run you trust with "python -m aoc verify --accept".
+
+@author: randyppa
+"""
+
+import os
+import json
+
+from aoc.days import ROOT
+from aoc.history import input_hash
+
+GOLDEN_FILE = os.path.join(ROOT, '.aoc', 'golden.json')
+
+
+class Golden:
+    def __init__(self, path=GOLDEN_FILE):
+        self.path = path
+        self.answers = {}   # {day: {input hash: {part: answer}}}
+        if os.path.exists(path):
+            with open(path, 'r') as fin:
+                self.answers = json.load(fin)
+        self._hashes = {}
+
+    def _hash(self, infile):
+        if infile not in self._hashes:
+            self._hashes[infile] = input_hash(infile)
+        return self._hashes[infile]
+
+    def expected(self, day, infile):
+        # {part: answer} for this input, empty if there are none
+        return self.answers.get(day.name, {}).get(self._hash(infile), {})
+
+    # Parts whose answer differs from the golden one, as a list of
+    # (part, expected, got)
+    def check(self, day, infile, answers):
+        expected = self.expected(day, infile)
+        wrong = []
+        for part, answer in answers.items():
+            if part in expected and str(answer) != expected[part]:
+                wrong.append((part, expected[part], str(answer)))
+        return wrong
+
+    # Store answers as golden. Only parts with no golden answer yet, unless
+    # replace. Returns the parts stored.
+    def accept(self, day, infile, answers, replace=False):
+        known = self.answers.setdefault(day.name, {}) \
+            .setdefault(self._hash(infile), {})
+        stored = []
+        for part, answer in answers.items():
+            if replace or part not in known:
+                known[part] = str(answer)
+                stored.append(part)
+        return stored
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + f'.{os.getpid()}.tmp'
+        with open(tmp, 'w') as fout:
+            json.dump(self.answers, fout, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+vm.py
+
+A small virtual machine for the puzzles' made-up assembly languages (the elf
+device of 2022 day 10 and the like).
+
+An InstructionSet holds the opcodes: each has a name, a cost in cycles and a
+handler, handler(machine, operand), that does its work on the machine's
+registers. Adding an opcode is one register() call; nothing else changes.
+
+A program is compiled once into two parallel arrays, opcode numbers and
+operands (one integer operand per line, 0 if there is none), as array
+operations over the whole text. A Machine then runs it in one tight loop
+that only looks up a handler and a cost per instruction.
+
+Hooks replace the "is this a cycle to look at" bookkeeping of each puzzle:
+  - at(cycles, callback): callback(machine, cycle) during each of the given
+    cycles, with the registers as they are during that cycle (before the
+    instruction running in it has finished);
+  - every(callback): the same, during every cycle;
+  - break_at(cycle): stop before the instruction running in that cycle
+    finishes. run() returns False, and the next run() goes on from there.
+A callback that returns True is a breakpoint too. The loop only checks the
+next hook cycle per instruction, so hooks at a few cycles cost nothing.
+
+Run "python -m aoc.vm" for a benchmark in cycles per second.
+
+@author: randyppa
+"""
+
+import numpy as np
+
+from aoc import counters
+from aoc.parsing import line_ints
+
+
+def _nothing(machine, operand):
+    pass
+
+
+class InstructionSet:
+    def __init__(self):
+        self.names = []         # Name of each opcode, by number
+        self.costs = []         # Cycles each opcode takes
+        self.handlers = []      # handler(machine, operand) of each opcode
+        self.numbers = {}       # {name: opcode number}
+
+    def register(self, name, cycles, handler=None):
+        if name in self.numbers:
+            raise ValueError(f'opcode {name} is already registered')
+        if cycles < 1:
+            raise ValueError(f'opcode {name} must take at least one cycle')
+        self.numbers[name] = len(self.names)
+        self.names.append(name)
+        self.costs.append(cycles)
+        self.handlers.append(handler if handler is not None else _nothing)
+        return handler
+
+    # Decorator form of register()
+    def opcode(self, name, cycles):
+        def decorate(handler):
+            return self.register(name, cycles, handler)
+        return decorate
+
+    # Compile program text: one instruction per line, the opcode name first,
+    # then at most one integer operand. Blank lines are skipped.
+    def compile(self, raw):
+        if isinstance(raw, str):
+            raw = raw.encode()
+        buf = np.frombuffer(raw, dtype=np.uint8)
+        starts = np.concatenate(([0], np.flatnonzero(buf == ord('\n')) + 1))
+        if buf.size == 0 or buf[-1] == ord('\n'):
+            starts = starts[:-1]            # No line after the last line end
+        nlines = starts.size
+        # Pad so that reading past the end of the last line is safe
+        padded = np.concatenate((buf, np.full(max(map(len, self.names),
+                                                  default=0) + 1,
+                                              ord('\n'), dtype=np.uint8)))
+        text = padded.copy()
+        ops = np.full(nlines, -1, dtype=np.int64)
+        for number, name in enumerate(self.names):
+            # Lines whose first word is the name
+            match = np.ones(nlines, dtype=bool)
+            for k, char in enumerate(name.encode()):
+                match &= padded[starts + k] == char
+            after = padded[starts + len(name)]
+            match &= (after == ord(' ')) | (after == ord('\n')) | \
+                (after == ord('\r')) | (after == ord('\t'))
+            ops[match] = number
+            # Blank the name out, so that digits in it are not operands
+            for k in range(len(name)):
+                text[starts[match] + k] = ord(' ')
+        blank = padded[starts] == ord('\n')
+        blank |= padded[starts] == ord('\r')
+        unknown = np.flatnonzero((ops < 0) & ~blank)
+        if unknown.size > 0:
+            line = int(unknown[0])
+            text = raw[starts[line]:].split(b'\n', 1)[0].decode().strip()
+            raise ValueError(f'line {line + 1}: unknown instruction {text!r}')
+        lines = line_ints(text[:buf.size].tobytes(), signed=True)
+        counts = lines.counts
+        if (counts > 1).any():
+            line = int(np.flatnonzero(counts > 1)[0])
+            raise ValueError(f'line {line + 1}: more than one operand')
+        operands = np.zeros(nlines, dtype=np.int64)
+        operands[counts == 1] = lines.values
+        keep = ~blank
+        return Program(self, ops[keep], operands[keep])
+
+
+class Program:
+    def __init__(self, instruction_set, ops, operands):
+        self.instruction_set = instruction_set
+        self.ops = ops              # Opcode number of each instruction
+        self.operands = operands
+
+    def __len__(self):
+        return len(self.ops)
+
+    # Cycles each instruction takes
+    @property
+    def costs(self):
+        return np.array(self.instruction_set.costs, dtype=np.int64)[self.ops]
+
+    # Total cycles to run the whole program
+    @property
+    def cycles(self):
+        return int(self.costs.sum())
+
+
+class Machine:
+    def __init__(self, program, **registers):
+        self.program = program
+        self.reg = dict(registers)
+        self.pc = 0             # Next instruction
+        self.cycle = 1          # Cycle that instruction starts in
+        self.hooks = {}         # {cycle: [callbacks]}
+        self.observers = []     # Callbacks for every cycle
+        self.done_to = 0        # Hooks have been called up to this cycle
+
+    def at(self, cycles, callback):
+        for cycle in cycles:
+            self.hooks.setdefault(cycle, []).append(callback)
+
+    def every(self, callback):
+        self.observers.append(callback)
+
+    def break_at(self, cycle):
+        self.at([cycle], lambda machine, cycle: True)
+
+    # Call the hooks of cycles first .. last - 1. True if one asks to stop.
+    def _call_hooks(self, first, last):
+        stop = False
+        for cycle in range(max(first, self.done_to + 1), last):
+            for callback in self.observers:
+                stop |= bool(callback(self, cycle))
+            for callback in self.hooks.get(cycle, ()):
+                stop |= bool(callback(self, cycle))
+            self.done_to = cycle
+            if stop:
+                break
+        return stop
+
+    # Run until the end of the program or a breakpoint. True at the end.
+    def run(self):
+        ops = self.program.ops.tolist()
+        operands = self.program.operands.tolist()
+        handlers = self.program.instruction_set.handlers
+        costs = self.program.instruction_set.costs
+        pending = sorted(cycle for cycle in self.hooks if cycle > self.done_to)
+        pending.reverse()       # Next hook cycle last, to pop
+        every = bool(self.observers)
+        pc = self.pc
+        cycle = first = self.cycle
+        end = len(ops)
+        stopped = False
+        while pc < end:
+            op = ops[pc]
+            cycle_end = cycle + costs[op]
+            if every or (pending and pending[-1] < cycle_end):
+                while pending and pending[-1] < cycle_end:
+                    pending.pop()
+                if self._call_hooks(cycle, cycle_end):
+                    stopped = True
+                    break
+            handlers[op](self, operands[pc])
+            pc += 1
+            cycle = cycle_end
+        counters.count('cycles', cycle - first)
+        self.pc = pc
+        self.cycle = cycle
+        return not stopped
+
+
+#=========== Benchmark =======
+
+def _elf_device():
+    # The instruction set of 2022 day 10
+    device = InstructionSet()
+    device.register('noop', 1)
+
+    @device.opcode('addx', 2)
+    def addx(machine, operand):
+        machine.reg['x'] += operand
+    return device
+
+
+def _random_program(ninstr, seed):
+    rng = np.random.default_rng(seed)
+    addx = rng.random(ninstr) < 0.7
+    values = rng.integers(-10, 11, ninstr)
+    return ''.join(f'addx {value}\n' if is_addx else 'noop\n'
+                   for is_addx, value in zip(addx.tolist(), values.tolist()))
+
+
+def benchmark(ninstr=1_000_000, repeat=3, seed=0):
+    import time
+    device = _elf_device()
+    text = _random_program(ninstr, seed).encode()
+    program = device.compile(text)
+    magic = range(20, program.cycles + 1, 40)
+
+    def plain():
+        Machine(program, x=1).run()
+
+    def hooked():
+        machine = Machine(program, x=1)
+        machine.at(magic, lambda machine, cycle: None)
+        machine.run()
+
+    def every():
+        machine = Machine(program, x=1)
+        machine.every(lambda machine, cycle: None)
+        machine.run()
+
+    cases = [
+        ('no hooks', plain),
+        (f'{len(magic)} hook cycles', hooked),
+        ('every cycle', every),
+    ]
+    print(f'{ninstr} instructions, {program.cycles} cycles, best of {repeat}')
+    best = None
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        device.compile(text)
+        seconds = time.perf_counter() - tic
+        best = seconds if best is None else min(best, seconds)
+    print(f'  compile: {best * 1000:.1f} ms, '
+          f'{ninstr / best:,.0f} instructions/s')
+    print(f'  {"run":<24}{"ms":>10}{"cycles/s":>14}')
+    for name, func in cases:
+        best = None
+        for _ in range(repeat):
+            tic = time.perf_counter()
+            func()
+            seconds = time.perf_counter() - tic
+            best = seconds if best is None else min(best, seconds)
+        print(f'  {name:<24}{best * 1000:>10.1f}'
+              f'{program.cycles / best:>14,.0f}')
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m aoc.vm',
+                                     description='VM benchmark')
+    parser.add_argument('-i', '--instructions', type=int, default=1_000_000)
+    parser.add_argument('-n', '--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    benchmark(args.instructions, args.repeat, args.seed)
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+watch.py
+
+Watch a day's files and re-run it whenever one changes, for tuning a solver
+without restarting the interpreter each time.
+
+The day's source, its input and the aoc modules it imports are polled for
+changes. The parsed input stays in memory between runs, and only the phases
+that a change can affect are run again:
+
+  - the input, or a shared aoc module: everything;
+  - the day's source: the module is reloaded, and each phase is compared
+    with its old version. A phase's "fingerprint" is the bytecode of its
+    function and of every function, class and constant of the module it
+    uses by name, plus all the module's classes (their methods are called
+    through the objects, not by name). Arrays it uses count by their
+    contents; any other object the module builds (like an instruction set
+    with registered handlers) can't be compared, so a phase that uses one
+    always runs again. Only phases whose fingerprint changed are run, and
+    the parse is kept unless its own fingerprint changed. So a comment or a change to part_b alone re-runs just what it
+    must.
+
+Each phase is timed over a few repeats (the parts on the same parsed data),
+and the median is shown with the change since the last time it ran.
+
+@author: randyppa
+"""
+
+import os
+import sys
+import time
+import types
+import hashlib
+import inspect
+import importlib
+import traceback
+
+from aoc import days
+from aoc.bench import PhaseTiming
+from aoc.cache import helper_files
+
+INTERVAL = 0.5      # Seconds between polls
+_SIMPLE = (int, float, complex, str, bytes, bool, tuple, list, dict, set,
+           frozenset, type(None))
+
+
+def _code_print(code):
+    # The parts of a code object that matter to what it does. Line numbers
+    # are left out, so moving code around changes nothing.
+    consts = tuple(_code_print(const) if isinstance(const, types.CodeType)
+                   else repr(const) for const in code.co_consts)
+    return (code.co_code, consts, code.co_names, code.co_varnames)
+
+
+def _functions(obj):
+    # The functions of a function or class, to look for names in
+    if inspect.isfunction(obj):
+        return [obj]
+    found = []
+    for value in vars(obj).values():
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        elif isinstance(value, property):
+            value = value.fget
+        if inspect.isfunction(value):
+            found.append(value)
+    return found
+
+
+def _names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _names(const)
+    return names
+
+
+def _own(module, obj):
+    return (inspect.isfunction(obj) or inspect.isclass(obj)) and \
+        getattr(obj, '__module__', None) == module.__name__
+
+
+def _elsewhere(value):
+    # Modules, and functions and classes of other modules (the aoc ones are
+    # watched as files), or a name that isn't a global at all
+    return value is None or inspect.ismodule(value) or \
+        inspect.isfunction(value) or inspect.isclass(value) or \
+        inspect.isbuiltin(value)
+
+
+def fingerprint(module, func):
+    todo = [func] + [obj for obj in vars(module).values()
+                     if inspect.isclass(obj) and _own(module, obj)]
+    prints = {}
+    while todo:
+        obj = todo.pop()
+        key = obj.__qualname__
+        if key in prints:
+            continue
+        funcs = _functions(obj)
+        prints[key] = tuple((f.__qualname__, _code_print(f.__code__),
+                             repr(f.__defaults__)) for f in funcs)
+        if inspect.isclass(obj):
+            prints[key] += tuple((name, repr(value)) for name, value
+                                 in vars(obj).items()
+                                 if isinstance(value, _SIMPLE))
+        for f in funcs:
+            for name in _names(f.__code__):
+                value = vars(module).get(name)
+                if _own(module, value):
+                    todo.append(value)
+                elif isinstance(value, _SIMPLE):
+                    prints['=' + name] = repr(value)
+                elif hasattr(value, 'dtype') and hasattr(value, 'tobytes'):
+                    # An array, maybe a table built by the module's code
+                    prints['=' + name] = (str(value.dtype), value.shape,
+                                          hashlib.sha256(value.tobytes())
+                                          .hexdigest())
+                elif not _elsewhere(value):
+                    # Something the module built, like an object with
+                    # registered handlers: no telling what changed, so
+                    # this never matches and the phase always runs again
+                    prints['=' + name] = object()
+    return tuple(sorted(prints.items()))
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class Watcher:
+    def __init__(self, day, infile=None, repeat=3):
+        self.day = day
+        self.fixed_input = infile   # None: the day's default input
+        self.repeat = repeat
+        self.data = None            # Parsed input, kept between runs
+        self.medians = {}           # Median ms of each phase's latest run
+        self.answers = {}
+        self.prints = {}            # Fingerprint of each phase
+        self.stamps = {}            # (mtime, size) of each watched file
+        self.runs = 0
+        self.infile = self._input()
+
+    def _input(self):
+        if self.fixed_input is not None:
+            return self.fixed_input
+        return self.day.default_input()
+
+    def files(self):
+        # The input is the one of the last version of the day that loaded,
+        # so a broken edit doesn't stop the watch
+        return [self.day.path, self.infile] + helper_files(self.day)
+
+    def changed(self):
+        # Files changed since the last call, and note their new stamps
+        changed = []
+        for path in self.files():
+            stamp = _stamp(path)
+            if self.stamps.get(path) != stamp:
+                changed.append(path)
+                self.stamps[path] = stamp
+        return changed
+
+    def _reload(self, helpers):
+        for path in helpers:
+            name = 'aoc.' + os.path.splitext(os.path.basename(path))[0]
+            if name in sys.modules:
+                importlib.reload(sys.modules[name])
+        self.day.reload()
+
+    # The phases to run after these files changed
+    def affected(self, changed):
+        helpers = [path for path in changed
+                   if path not in (self.day.path, self.infile)]
+        old_input = self.infile
+        if helpers or self.day.path in changed:
+            self._reload(helpers)
+        module = self.day.module
+        self.infile = self._input()
+        prints = {phase: fingerprint(module, func)
+                  for phase, func in self.day.parts}
+        if self.data is None or helpers or self.infile != old_input or \
+                self.infile in changed or \
+                prints['parse'] != self.prints.get('parse'):
+            phases = list(prints)
+        else:
+            phases = [phase for phase in prints
+                      if prints[phase] != self.prints.get(phase)]
+        self.prints = prints
+        return phases
+
+    def run(self, phases):
+        funcs = dict(self.day.parts)
+        for phase in funcs:
+            if phase not in phases:
+                if phase in self.medians:
+                    print(f'  {phase:<8}{self.medians[phase]:>12.3f} ms'
+                          '   (kept)')
+                continue
+            timing = PhaseTiming(phase)
+            for _ in range(self.repeat):
+                tic = time.perf_counter()
+                if phase == 'parse':
+                    self.data = None    # Lost if the parse fails
+                    data = funcs[phase](self.infile)
+                else:
+                    answer = funcs[phase](self.data)
+                timing.add(time.perf_counter() - tic)
+            if phase == 'parse':
+                self.data = data
+            self._report(timing, None if phase == 'parse' else answer)
+
+    def _report(self, timing, answer):
+        phase = timing.phase
+        line = f'  {phase:<8}{timing.median:>12.3f} ms'
+        if phase in self.medians:
+            delta = timing.median - self.medians[phase]
+            percent = 100 * delta / self.medians[phase] \
+                if self.medians[phase] > 0 else 0
+            line += f'{delta:>+12.3f} ms ({percent:+.1f}%)'
+        self.medians[phase] = timing.median
+        if answer is not None:
+            text = str(answer)
+            if phase in self.answers and self.answers[phase] != text:
+                line += '   CHANGED'
+            self.answers[phase] = text
+            if '\n' in text:
+                line += '\n' + '\n'.join('    ' + row
+                                         for row in text.splitlines())
+            else:
+                line += f'   Part {phase}: {text}'
+        print(line)
+
+    # One poll: run whatever the changes affect. Errors in the solver are
+    # shown and the watch goes on.
+    def poll(self):
+        changed = self.changed()
+        if not changed:
+            return False
+        self.runs += 1
+        names = ', '.join(os.path.relpath(path, days.ROOT) for path in changed)
+        when = time.strftime('%H:%M:%S')
+        try:
+            phases = self.affected(changed)
+            if self.runs == 1:
+                print(f'[{when}] first run')
+            elif not phases:
+                print(f'[{when}] {names} changed: nothing to re-run')
+                return True
+            else:
+                print(f'[{when}] {names} changed: running '
+                      f'{", ".join(phases)}')
+            self.run(phases)
+        except Exception:
+            print(f'[{when}] {names} changed: failed')
+            traceback.print_exc(limit=-3, file=sys.stdout)
+            self.prints = {}    # Run everything once it works again
+        sys.stdout.flush()
+        return True
+
+
+def watch(day, infile=None, repeat=3, interval=INTERVAL):
+    watcher = Watcher(day, infile, repeat)
+    print(f'{day}: watching {len(watcher.files())} files, Ctrl-C to stop')
+    try:
+        while True:
+            watcher.poll()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print()
+    return 0